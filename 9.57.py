@@ -4,18 +4,26 @@ Overlay UltraLite - V9.57 (Comment Translation)
 """
 from __future__ import annotations
 
+import asyncio
+import bisect
 import json
 import os
 import re
+import shutil
+import subprocess
 import sys
 import threading
 import time
-from collections import deque
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import itemgetter
 from enum import Enum, auto
-from typing import Any, Callable, Dict, List, Optional
+from importlib.util import find_spec
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from typing import Union
 
-from PySide6.QtGui import (QColor,  QMouseEvent, QPaintEvent,
+from PySide6.QtGui import (QBrush, QColor,  QMouseEvent, QPaintEvent,
                             QDragEnterEvent, QDropEvent)
 from PySide6.QtWidgets import (
     QApplication, QCheckBox, QColorDialog, QComboBox,
@@ -25,12 +33,13 @@ from PySide6.QtWidgets import (
     QRadioButton, QSplitter, QTabWidget,
     QTextEdit, QTreeWidget, QTreeWidgetItem, QVBoxLayout,
     QWidget, QSlider, QSpinBox)
-from PySide6.QtCore import Signal, QObject, QRect, Qt, QPointF,  QTimer, QPoint
+from PySide6.QtCore import Signal, QObject, QRect, Qt, QPointF,  QTimer, QPoint, QSignalBlocker
 
 from speech_engine import SpeechEngine
-from ui_components import GiftListDialog, GameMenuContainer, MenuItemWidget, TriggerEditDialog
+from ui_components import GiftListDialog, GameMenuContainer, TriggerEditDialog
 from trigger_manager import TriggerManager
-from data_managers import LayoutsManager,  LibraryManager, ThemeManager
+from data_managers import (AppendLogWriter, DebouncedSaver, LayoutsManager,  LibraryManager, ThemeManager,
+                           atomic_write_json)
 # 新增：Gemini 翻譯模組匯入（可缺省）
 try:
     # 新增了 list_generation_models 的匯入
@@ -40,49 +49,28 @@ except Exception:
     GeminiTranslator = None
     list_generation_models = None # 確保在 import 失敗時此變數存在
     _HAS_GEMINI = False
-# --- Pillow 依賴 (用於 WebP 支援) ---
-try:
-    from PIL import Image
-    _HAS_PILLOW = True
-except ImportError:
-    Image = None
-    _HAS_PILLOW = False
-
-# --- TikTokLiveClient 依賴 ---
-try:
-    from TikTokLive import TikTokLiveClient
-    from TikTokLive.client.web.web_settings import WebDefaults
-    from TikTokLive.events import (CommentEvent, ConnectEvent, DisconnectEvent,
-                                   FollowEvent, GiftEvent, JoinEvent,
-                                   LikeEvent)
-    _HAS_TIKTOK_LIVE = True
-except ImportError:
-    TikTokLiveClient = None
-    WebDefaults = None
-    CommentEvent, ConnectEvent, DisconnectEvent, GiftEvent, LikeEvent, JoinEvent, FollowEvent = (None,) * 7
-    _HAS_TIKTOK_LIVE = False
-
-# --- OpenCV 依賴 ---
-try:
-    import cv2
-except ImportError:
-    cv2 = None
-
-# --- MPV 依賴 ---
-try:
-    import mpv
-    _HAS_MPV = True
-except ImportError:
-    mpv = None
-    _HAS_MPV = False
-
-# --- pyttsx3 依賴 ---
-try:
-    import pyttsx3
-    _HAS_TTS = True
-except ImportError:
-    pyttsx3 = None
-    _HAS_TTS = False
+# --- Pillow 依賴 (用於 WebP 支援；實際載入在 ui_components 第一次讀圖時) ---
+_HAS_PILLOW = find_spec("PIL") is not None
+
+# --- 重量級依賴：啟動時只用 find_spec 偵測，實際 import 延後到第一次使用（_require_*）---
+# TikTokLiveClient：按下「開始」時才載入
+_HAS_TIKTOK_LIVE = find_spec("TikTokLive") is not None
+TikTokLiveClient = None
+WebDefaults = None
+CommentEvent, ConnectEvent, DisconnectEvent, GiftEvent, LikeEvent, JoinEvent, FollowEvent = (None,) * 7
+
+# 影片尺寸探測：優先用 PyAV / ffprobe 只讀容器標頭，OpenCV 作為最後備援；都在第一次讀取影片尺寸時才載入
+_HAS_AV = find_spec("av") is not None
+av = None
+_HAS_CV2 = find_spec("cv2") is not None
+cv2 = None
+
+# MPV：建立播放器時才載入
+_HAS_MPV = find_spec("mpv") is not None
+mpv = None
+
+# pyttsx3：由 speech_engine 在朗讀執行緒內載入，這裡只需要可用性
+_HAS_TTS = find_spec("pyttsx3") is not None
 # --- Aho-Corasick 依賴（多關鍵字高效比對）---
 try:
     import ahocorasick  # pip install pyahocorasick
@@ -90,6 +78,13 @@ try:
 except ImportError:
     ahocorasick = None
     _HAS_AHOCORASICK = False
+# --- orjson 依賴（較快的 JSON 編解碼，可缺省）---
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    _HAS_ORJSON = False
 # --- 處理打包路徑的核心程式碼 ---
 if getattr(sys, 'frozen', False):
     # 如果是在打包後的環境中運行
@@ -166,22 +161,249 @@ def _translate_in_process(api_key_str: str, model_name_str: str, text_to_transla
         error_message = f"{type(e).__name__}: {e}"
         result_queue.put(("FAILURE", error_message))
 
+def _json_dumps(obj: Any) -> bytes:
+    """序列化為縮排 2 的 UTF-8 JSON bytes（可直接交給 DebouncedSaver 單次寫出）；有 orjson 時走 C 實作。"""
+    if _HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _json_loads(raw: Union[str, bytes]) -> Any:
+    # orjson.JSONDecodeError 繼承自 json.JSONDecodeError，呼叫端的 except 不需改
+    if _HAS_ORJSON:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
 # ==================== 型別宣告 & 資料類別 ====================
 Layout = dict[str, float]
 LayoutsData = dict[str, dict[str, Layout]]
 GiftMapItem = Dict[str, Any]
 GiftInfo = Dict[str, str]
 
+
+# 直播熱路徑事件：以 __slots__ 資料類別取代每筆一個 dict（LOG 等冷路徑仍沿用 dict）
+@dataclass
+class CommentEv:
+    __slots__ = ("user", "message")
+    user: str
+    message: str
+
+
+@dataclass
+class GiftEv:
+    __slots__ = ("user", "gift_name", "count")
+    user: str
+    gift_name: str
+    count: int
+
+
+@dataclass
+class LikeEv:
+    __slots__ = ("user", "count")
+    user: str
+    count: int
+
+
+@dataclass
+class JoinEv:
+    __slots__ = ("user",)
+    user: str
+
+
+@dataclass
+class FollowEv:
+    __slots__ = ("user",)
+    user: str
+
+
+TikTokEvent = Union[CommentEv, GiftEv, LikeEv, JoinEv, FollowEv, Dict[str, Any]]
+
+# ==================== 路徑存在快取 =========================
+# 熱路徑（收到禮物、刷新列表）避免每次都打 os.path.exists；TTL 到期或映射變動時重新檢查
+# 依插入順序淘汰最舊的項目，避免長時間執行後無限成長
+_PATH_EXISTS_CACHE: Dict[str, Tuple[float, bool]] = {}
+_PATH_EXISTS_CACHE_MAX = 4096
+
+
+def _path_exists_cached(path: str, ttl: float = 5.0) -> bool:
+    if not path:
+        return False
+    now = time.monotonic()
+    hit = _PATH_EXISTS_CACHE.pop(path, None)
+    if hit is not None and now - hit[0] < ttl:
+        _PATH_EXISTS_CACHE[path] = hit
+        return hit[1]
+    exists = os.path.exists(path)
+    if len(_PATH_EXISTS_CACHE) >= _PATH_EXISTS_CACHE_MAX:
+        del _PATH_EXISTS_CACHE[next(iter(_PATH_EXISTS_CACHE))]
+    _PATH_EXISTS_CACHE[path] = (now, exists)
+    return exists
+
+
+def _invalidate_path_exists_cache(path: Optional[str] = None):
+    """不帶參數清空整個快取；帶路徑則只丟掉該筆（例如剛選好的檔案）。"""
+    if path is None:
+        _PATH_EXISTS_CACHE.clear()
+    else:
+        _PATH_EXISTS_CACHE.pop(path, None)
+
+
+# 可加入媒體清單/設為後備影片的副檔名（小寫、不含點）與對應的檔案對話框篩選字串
+_VIDEO_EXTS = ("mp4", "mkv", "mov", "avi")
+_VIDEO_SUFFIXES = frozenset(_VIDEO_EXTS)
+_VIDEO_FILE_FILTER = "影片檔案 ({})".format(" ".join(f"*.{ext}" for ext in _VIDEO_EXTS))
+
+
+def _is_video_file(path: str) -> bool:
+    return path.rpartition(".")[2].lower() in _VIDEO_SUFFIXES
+
+
+@lru_cache(maxsize=4096)
+def _basename(path: str) -> str:
+    # 列表刷新時每列都要取檔名；路徑大多不變，直接記住結果
+    return os.path.basename(path)
+
+
+@lru_cache(maxsize=64)
+def _color_swatch_style(color: str, light_text: bool) -> str:
+    # 外觀設定頁顏色按鈕的樣式；同一顏色重複套用時不必再組字串
+    if light_text:
+        return f"background-color: {color}; color: white; text-shadow: 1px 1px 2px black;"
+    return f"background-color: {color}; color: black; text-shadow: 1px 1px 2px white;"
+
+
+# 列表中標示「檔案不存在」的前景色；共用同一個 brush，刷新時不必每列重新解析顏色
+_MISSING_FILE_BRUSH = QBrush(QColor(255, 0, 0))
+# 即時動態列表各類事件的文字顏色（同樣預先建好）
+_EVENT_BRUSHES: Dict[str, QBrush] = {
+    name: QBrush(QColor(name)) for name in ("darkGreen", "red", "gray", "blue", "orange")
+}
+
+
+# ==================== 延遲載入 ===========================================
+def _require_tiktoklive() -> bool:
+    """第一次呼叫時載入 TikTokLive 相關類別；成功回傳 True。"""
+    global _HAS_TIKTOK_LIVE, TikTokLiveClient, WebDefaults
+    global CommentEvent, ConnectEvent, DisconnectEvent, GiftEvent, LikeEvent, JoinEvent, FollowEvent
+    if TikTokLiveClient is not None:
+        return True
+    if not _HAS_TIKTOK_LIVE:
+        return False
+    try:
+        from TikTokLive import TikTokLiveClient as _client
+        from TikTokLive.client.web.web_settings import WebDefaults as _defaults
+        from TikTokLive.events import (CommentEvent as _comment, ConnectEvent as _connect,
+                                       DisconnectEvent as _disconnect, FollowEvent as _follow,
+                                       GiftEvent as _gift, JoinEvent as _join, LikeEvent as _like)
+    except ImportError:
+        _HAS_TIKTOK_LIVE = False
+        return False
+    WebDefaults = _defaults
+    CommentEvent, ConnectEvent, DisconnectEvent = _comment, _connect, _disconnect
+    GiftEvent, LikeEvent, JoinEvent, FollowEvent = _gift, _like, _join, _follow
+    TikTokLiveClient = _client  # 最後指派，作為「已載入」的旗標
+    return True
+
+
+def _require_cv2():
+    """回傳 cv2 模組；未安裝時回傳 None。"""
+    global _HAS_CV2, cv2
+    if cv2 is None and _HAS_CV2:
+        try:
+            import cv2 as _cv2
+            cv2 = _cv2
+        except ImportError:
+            _HAS_CV2 = False
+    return cv2
+
+
+def _require_av():
+    """回傳 PyAV 模組；未安裝時回傳 None。"""
+    global _HAS_AV, av
+    if av is None and _HAS_AV:
+        try:
+            import av as _av
+            av = _av
+        except ImportError:
+            _HAS_AV = False
+    return av
+
+
+@lru_cache(maxsize=1)
+def _ffprobe_path() -> Optional[str]:
+    return shutil.which("ffprobe")
+
+
+def _probe_dims_fast(path: str) -> Optional[tuple[int, int]]:
+    """讀取影片寬高：PyAV → ffprobe → cv2，依序嘗試；全部失敗回傳 None。
+
+    PyAV 與 ffprobe 只解析容器標頭，不必像 cv2.VideoCapture 那樣初始化解碼器。
+    """
+    if _require_av() is not None:
+        try:
+            with av.open(path) as container:
+                stream = container.streams.video[0]
+                width, height = stream.codec_context.width, stream.codec_context.height
+            if width and height:
+                return width, height
+        except Exception:  # 無影像串流、格式不支援等，交給下一種方式
+            pass
+
+    ffprobe = _ffprobe_path()
+    if ffprobe:
+        try:
+            result = subprocess.run(
+                [ffprobe, "-v", "error", "-select_streams", "v:0",
+                 "-show_entries", "stream=width,height", "-of", "csv=p=0", path],
+                capture_output=True, text=True, timeout=5,
+                # Windows 下不要彈出主控台視窗
+                creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0))
+            width, height = (int(v) for v in result.stdout.strip().split(",")[:2])
+            if width and height:
+                return width, height
+        except (OSError, subprocess.SubprocessError, ValueError):
+            pass
+
+    if _require_cv2() is not None:
+        cap = cv2.VideoCapture(path)
+        try:
+            if cap.isOpened():
+                width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+                height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+                if width and height:
+                    return width, height
+        finally:
+            cap.release()
+    return None
+
+
+def _can_probe_video_dims() -> bool:
+    return _HAS_AV or _HAS_CV2 or _ffprobe_path() is not None
+
+
 # ==================== mpv 可用性偵測 & 精準例外 =========================
 MPV_ERRORS: tuple[type, ...] = ()
 MPV_CALL_ERRORS: tuple[type, ...] = ()
-if _HAS_MPV:
-    MPV_ERRORS = tuple([
-        exc for name in ("Error", "MPVError")
-        if (exc := getattr(mpv, name, None)) and isinstance(exc, type)
-    ])
-    MPV_CALL_ERRORS = MPV_ERRORS + (AttributeError, RuntimeError, TypeError,
-                                    ValueError)
+
+
+def _require_mpv():
+    """載入 mpv 並填入 MPV_ERRORS / MPV_CALL_ERRORS；未安裝時回傳 None。"""
+    global _HAS_MPV, mpv, MPV_ERRORS, MPV_CALL_ERRORS
+    if mpv is None and _HAS_MPV:
+        try:
+            import mpv as _mpv
+        except (ImportError, OSError):  # OSError：找不到 libmpv
+            _HAS_MPV = False
+            return None
+        mpv = _mpv
+        MPV_ERRORS = tuple([
+            exc for name in ("Error", "MPVError")
+            if (exc := getattr(mpv, name, None)) and isinstance(exc, type)
+        ])
+        MPV_CALL_ERRORS = MPV_ERRORS + (AttributeError, RuntimeError, TypeError,
+                                        ValueError)
+    return mpv
 
 
 class PlayerState(Enum):
@@ -218,17 +440,68 @@ class GiftManager:
         "description": ""
     }]
 
-    def __init__(self, filename="gifts.json"):
+    def __init__(self, filename="gifts.json", saver: Optional[DebouncedSaver] = None):
         self.filename = filename
-        self.gifts: List[GiftInfo] = []
+        self._saver = saver or DebouncedSaver()
+        # name_en（唯一鍵）-> 禮物；dict 保留插入順序，存檔時仍輸出成 list
+        self.gifts: Dict[str, GiftInfo] = {}
+        # 快取：排序後清單（與其排序鍵平行的 _sorted_keys）與 name_en -> name_cn 對照
+        # 新增/修改/刪除時增量維護排序清單；重新載入時整份失效
+        self._sorted_cache: Optional[List[GiftInfo]] = None
+        self._sorted_keys: List[str] = []
+        # 每次增刪改/重新載入都遞增；衍生的對照表以此判斷是否過期
+        self.version: int = 0
+        self._index_version = -1
+        self._name_index: Dict[str, str] = {}
+        self._id_index: Dict[str, str] = {}
         self.load()
 
+    def _invalidate_cache(self):
+        self._sorted_cache = None
+        self._sorted_keys = []
+        self.version += 1
+
+    def _sorted_insert(self, gift: GiftInfo):
+        if self._sorted_cache is None:
+            return
+        key = gift.get("name_cn", "")
+        # bisect_right：同鍵排在既有項目之後，與 sorted() 的穩定排序一致
+        i = bisect.bisect_right(self._sorted_keys, key)
+        self._sorted_keys.insert(i, key)
+        self._sorted_cache.insert(i, gift)
+
+    def _sorted_remove(self, gift: GiftInfo):
+        if self._sorted_cache is None:
+            return
+        keys = self._sorted_keys
+        key = gift.get("name_cn", "")
+        i = bisect.bisect_left(keys, key)
+        while i < len(keys) and keys[i] == key:
+            if self._sorted_cache[i] is gift:
+                del keys[i]
+                del self._sorted_cache[i]
+                return
+            i += 1
+        self._sorted_cache = None  # 找不到（資料被外部改過）就整份重建
+
+    @staticmethod
+    def _to_dict(items: List[GiftInfo]) -> Dict[str, GiftInfo]:
+        # 同名以第一筆為準（與舊版線性搜尋的結果一致）
+        gifts: Dict[str, GiftInfo] = {}
+        for g in items:
+            if isinstance(g, dict):
+                gifts.setdefault(g.get("name_en", ""), g)
+        return gifts
+
     def load(self):
+        self._invalidate_cache()
         if os.path.exists(self.filename):
             try:
-                with open(self.filename, "r", encoding="utf-8") as f:
-                    self.gifts = json.load(f)
-                if not isinstance(self.gifts, list):
+                with open(self.filename, "rb") as f:
+                    data = _json_loads(f.read())
+                if isinstance(data, list):
+                    self.gifts = self._to_dict(data)
+                else:
                     self._reset_to_default()
             except (IOError, json.JSONDecodeError):
                 self._reset_to_default()
@@ -236,24 +509,54 @@ class GiftManager:
             self._reset_to_default()
 
     def save(self):
+        # 先在呼叫端序列化成快照，實際寫檔交給背景 saver 合併執行
         try:
-            with open(self.filename, "w", encoding="utf-8") as f:
-                json.dump(self.gifts,
-                          f,
-                          indent=2,
-                          ensure_ascii=False)
-        except IOError:
-            print(f"错误: 无法储存礼物清单到 {self.filename}")
+            text = _json_dumps(list(self.gifts.values()))
+        except (TypeError, ValueError) as e:
+            print(f"错误: 无法序列化礼物清单: {e}")
+            return
+        self._saver.schedule(self.filename, text)
 
     def _reset_to_default(self):
-        self.gifts = self.DEFAULT_GIFTS
+        # 複製一份，避免之後原地增刪改到類別層級的預設清單
+        self.gifts = self._to_dict([dict(g) for g in self.DEFAULT_GIFTS])
+        self._invalidate_cache()
         self.save()
 
     def get_all_gifts(self) -> List[GiftInfo]:
-        return sorted(self.gifts, key=lambda x: x.get("name_cn", ""))
+        if self._sorted_cache is None:
+            self._sorted_cache = sorted(self.gifts.values(), key=lambda x: x.get("name_cn", ""))
+            self._sorted_keys = [g.get("name_cn", "") for g in self._sorted_cache]
+        return list(self._sorted_cache)
+
+    def _ensure_indexes(self):
+        if self._index_version == self.version:
+            return
+        self._name_index = {en: g.get("name_cn", g.get("name_en")) for en, g in self.gifts.items()}
+        self._id_index = {en: g.get("id") for en, g in self.gifts.items()}
+        self._index_version = self.version
+
+    def get_name_index(self) -> Dict[str, str]:
+        """name_en -> name_cn（無中文名時回退英文名）；回傳的是快取，請勿修改。"""
+        self._ensure_indexes()
+        return self._name_index
+
+    def get_id_index(self) -> Dict[str, str]:
+        """name_en -> 禮物 id；回傳的是快取，請勿修改。"""
+        self._ensure_indexes()
+        return self._id_index
+
+    def _put(self, gift_info: GiftInfo):
+        # 同名覆寫時先把舊項目移出排序快取
+        old = self.gifts.get(gift_info.get("name_en", ""))
+        if old is not None:
+            self._sorted_remove(old)
+        self.gifts[gift_info.get("name_en", "")] = gift_info
+        self._sorted_insert(gift_info)
 
     def add_gift(self, gift_info: GiftInfo):
-        self.gifts.append(gift_info)
+        self._put(gift_info)
+        self.version += 1
         self.save()
 
     def add_gifts_batch(self, gifts_to_add: List[GiftInfo]) -> int:
@@ -265,65 +568,136 @@ class GiftManager:
             return 0
 
         # 為了避免重複，先建立一個現有英文名的集合
-        existing_names = {g.get("name_en", "").lower() for g in self.gifts if g.get("name_en")}
+        existing_names = {en.lower() for en in self.gifts if en}
 
         added_count = 0
         for new_gift in gifts_to_add:
             new_name_en = new_gift.get("name_en", "").lower()
             # 如果提供了英文名，且該名稱尚未存在，才進行新增
             if new_name_en and new_name_en not in existing_names:
-                self.gifts.append(new_gift)
+                self._put(new_gift)
                 existing_names.add(new_name_en)  # 更新集合，以防批次內部有重複
                 added_count += 1
 
         # 如果有任何禮物被成功新增，才執行存檔
         if added_count > 0:
+            self.version += 1
             self.save()
 
         return added_count
 
     def update_gift_by_name(self, original_name_en: str, new_gift_info: GiftInfo):
-        """根據禮物的原始英文名來更新禮物資訊"""
-        for i, gift in enumerate(self.gifts):
-            if gift.get("name_en") == original_name_en:
-                self.gifts[i] = new_gift_info
-                self.save()
-                return True
-        return False
+        """根據禮物的原始英文名來更新禮物資訊；改名成已存在的英文名時不覆蓋，回傳 False"""
+        old = self.gifts.get(original_name_en)
+        if old is None:
+            return False
+        new_name_en = new_gift_info.get("name_en", "")
+        if new_name_en != original_name_en:
+            if new_name_en in self.gifts:
+                return False
+            # 真正改名才換鍵（等同移除後重新加入，排到最後）
+            del self.gifts[original_name_en]
+        self._sorted_remove(old)
+        # 鍵不變時原地賦值，dict 與 gifts.json 的順序都不動
+        self.gifts[new_name_en] = new_gift_info
+        self._sorted_insert(new_gift_info)
+        self.version += 1
+        self.save()
+        return True
 
     def delete_gift_by_name(self, name_en: str):
         """根據禮物的英文名 (唯一鍵) 來刪除禮物"""
-        initial_len = len(self.gifts)
-        self.gifts = [gift for gift in self.gifts if gift.get("name_en") != name_en]
-        if len(self.gifts) < initial_len:
-            self.save()
+        old = self.gifts.pop(name_en, None)
+        if old is None:
+            return False
+        self._sorted_remove(old)
+        self.version += 1
+        self.save()
+        return True
 
 
 # ==================== TikTok 監聽核心 ===================
 class TikTokListener(QObject):
+    """
+    TikTok 直播監聽。執行緒約定：
+    - 連線與事件回呼在常駐的 asyncio 執行緒；整批事件由 drain 執行緒送出。
+    - 下列 signal 可能從任一執行緒 emit，UI 端一律以 QueuedConnection 連接，槽函式只會在 GUI 執行緒執行。
+    """
     on_video_triggered = Signal(str, bool, int)
-    on_event_received = Signal(dict)
+    on_event_received = Signal(object)
+    on_events_batch = Signal(list)
     on_status_change = Signal(str)
 
+    _USERNAME_RE = re.compile(r"tiktok\.com/@([^/?]+)")
+    # 事件佇列：監聽執行緒只負責入列，由 drain 執行緒約每幀（~16ms）整批送往 GUI
+    _EVENT_QUEUE_MAX = 4096
+    _EVENT_FLUSH_INTERVAL = 0.016
+    # 按讚量大時先依使用者累加，每 ~100ms 才送出一批 LikeEv
+    _LIKE_FLUSH_INTERVAL = 0.1
+    # 禮物去重：只針對 combo 結束封包（同一連擊的結束封包可能重送），同一封包
+    # （見 _gift_dedup_key）在視窗內只處理一次；非 combo 禮物一律照收
+    _DEDUP_MAX = 512
+    _DEDUP_WINDOW = 2.0
+    # 連擊合併：同一 (user, gift_id, path) 在視窗內的觸發合併成一次 emit，次數相加
+    _COMBO_WINDOW = 0.25
+    # 關鍵字少於此數時逐一比對（C 層子字串搜尋）反而比走 automaton 快
+    _AC_MIN_KEYWORDS = 16
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.client: Optional[TikTokLiveClient] = None
-        self.thread: Optional[threading.Thread] = None
+        # 單一常駐 asyncio 事件圈（daemon 執行緒），每次 start 只排入一個連線協程
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._future = None  # concurrent.futures.Future of _run_client
         self.running = False
         self.gift_map: List[GiftMapItem] = []
-        self.fallback_video_path: str = ""
+        self._fallback_video_path: str = ""
+        self._fallback_exists = False  # 指派 fallback_video_path 時檢查一次，on_gift 不再打檔案系統
         self.interrupt_on_gift = False
+        # 禮物映射索引（gift_map 變動後需呼叫 _rebuild_indexes）
+        self._gid_index: Dict[str, GiftMapItem] = {}
+        self._kw_index: List[Tuple[str, GiftMapItem]] = []
+        self._kw_automaton = None  # Aho-Corasick：kw casefold -> (順位, item)；未安裝時為 None
 
         # 新增：並發防護與工作階段 id
         self._lock = threading.RLock()
         self._session_id = 0  # 每次 start 都會 +1，用於讓舊 handler 失效
 
-    @staticmethod
-    def _extract_username(url: str) -> Optional[str]:
-        m = re.search(r"tiktok\.com/@([^/?]+)", url)
+        # 新增：事件批次佇列（滿了自動丟棄最舊的）
+        self._event_queue: deque = deque(maxlen=self._EVENT_QUEUE_MAX)
+        self._event_wake = threading.Event()
+        self._event_dropped = 0
+        self._drain_thread: Optional[threading.Thread] = None
+        self._like_accum: Dict[str, int] = {}  # user -> 累計讚數（事件圈寫、drain 執行緒取走）
+        self._like_lock = threading.Lock()
+        self._last_like_flush = 0.0
+        self._recent_gift_keys: "OrderedDict[tuple, float]" = OrderedDict()
+        # (user, gift_id, path) -> [累計次數, interrupt, session]；只在事件圈執行緒存取
+        self._combo_accumulator: Dict[Tuple[str, int, str], list] = {}
+
+    @property
+    def fallback_video_path(self) -> str:
+        return self._fallback_video_path
+
+    @fallback_video_path.setter
+    def fallback_video_path(self, path: str):
+        path = (path or "").strip()
+        if path != self._fallback_video_path:
+            _invalidate_path_exists_cache(path)
+        self._fallback_video_path = path
+        self._fallback_exists = bool(path) and os.path.exists(path)
+
+    def set_fallback_video_path(self, path: str):
+        self.fallback_video_path = path
+
+    @classmethod
+    def _extract_username(cls, url: str) -> Optional[str]:
+        m = cls._USERNAME_RE.search(url)
         return m.group(1) if m else None
 
     def start(self, url: str, api_key: str):
+        # 只檢查是否安裝；真正 import TikTokLive 延到事件迴圈執行緒（見 _run_client），不卡 UI
         if not _HAS_TIKTOK_LIVE:
             self.on_event_received.emit({
                 "type": "LOG", "tag": "ERROR", "message": "錯誤: 'TikTokLive' 函式庫未安裝"
@@ -344,7 +718,7 @@ class TikTokListener(QObject):
 
         with self._lock:
             # 若先前仍在跑，直接阻擋（或改為先 stop 再啟動）
-            if self.thread and self.thread.is_alive():
+            if self._future and not self._future.done():
                 self.on_event_received.emit({
                     "type": "LOG", "tag": "WARN", "message": "監聽已在執行，已忽略重複啟動。"
                 })
@@ -356,14 +730,16 @@ class TikTokListener(QObject):
             self.running = True
             self._session_id += 1
             session = self._session_id
+            self._rebuild_indexes()
+            self._ensure_drain_thread()
 
             # 立即通知 UI 正在連線，並避免使用者連點
             self.on_status_change.emit(f"正在連線至 @{username}...")
 
-            self.thread = threading.Thread(
-                target=self._run_client, args=(username, api_key, session), daemon=True
+            loop = self._ensure_loop()
+            self._future = asyncio.run_coroutine_threadsafe(
+                self._run_client(username, api_key, session), loop
             )
-            self.thread.start()
 
     def stop(self):
         with self._lock:
@@ -371,47 +747,194 @@ class TikTokListener(QObject):
             self._session_id += 1
             self.running = False
 
-            if self.client:
-                try:
-                    self.client.stop()
-                except OSError as e:
-                    if "[WinError 6]" in str(e):
-                        print("[INFO] 捕捉到良性的網路控制代碼關閉錯誤，已忽略。")
-                    else:
-                        self.on_event_received.emit({
-                            "type": "LOG", "tag": "WARN", "message": f"停止 client 時發生 OSError: {e}"
-                        })
-                except Exception as e:
-                    self.on_event_received.emit({
-                        "type": "LOG", "tag": "WARN", "message": f"停止 client 時發生錯誤: {e}"
-                    })
-
-            if self.thread and self.thread.is_alive():
-                self.thread.join(timeout=2.0)
+            # 關閉 client 與取消連線協程都交給事件迴圈執行緒做，UI 不等待
+            if self._loop and (self.client or self._future):
+                asyncio.run_coroutine_threadsafe(self._stop_client(self.client, self._future), self._loop)
 
             self._unsafe_cleanup()
             self.on_status_change.emit("已停止")
 
+    def _post_event(self, event: TikTokEvent):
+        # 供監聽執行緒呼叫：只入列並喚醒 drain 執行緒，不直接跨執行緒 emit
+        if len(self._event_queue) >= self._EVENT_QUEUE_MAX:
+            self._event_dropped += 1
+        self._event_queue.append(event)
+        self._event_wake.set()
+
+    def _ensure_drain_thread(self):
+        if self._drain_thread and self._drain_thread.is_alive():
+            return
+        self._drain_thread = threading.Thread(target=self._drain_events, daemon=True)
+        self._drain_thread.start()
+
+    def _post_like(self, user: str, count: int):
+        # 供監聽執行緒呼叫：只累加，由 drain 執行緒依 _LIKE_FLUSH_INTERVAL 合併送出
+        with self._like_lock:
+            self._like_accum[user] = self._like_accum.get(user, 0) + count
+        self._event_wake.set()
+
+    def _take_likes(self) -> List[LikeEv]:
+        now = time.monotonic()
+        if not self._like_accum or now - self._last_like_flush < self._LIKE_FLUSH_INTERVAL:
+            return []
+        with self._like_lock:
+            accum, self._like_accum = self._like_accum, {}
+        self._last_like_flush = now
+        return [LikeEv(user, count) for user, count in accum.items()]
+
+    def _drain_events(self):
+        q = self._event_queue
+        while True:
+            # 還有未送出的讚時定時醒來，避免最後一批卡在累加器裡
+            self._event_wake.wait(self._LIKE_FLUSH_INTERVAL if self._like_accum else None)
+            # 稍等一幀，讓同一波事件累積成一批
+            time.sleep(self._EVENT_FLUSH_INTERVAL)
+            self._event_wake.clear()
+            batch = []
+            while q:
+                try:
+                    batch.append(q.popleft())
+                except IndexError:
+                    break
+            batch.extend(self._take_likes())
+            dropped, self._event_dropped = self._event_dropped, 0
+            if dropped:
+                batch.append({
+                    "type": "LOG", "tag": "WARN", "message": f"事件過多，已丟棄 {dropped} 筆最舊事件。"
+                })
+            if batch:
+                self.on_events_batch.emit(batch)
+
+    @staticmethod
+    def _gift_dedup_key(evt: "GiftEvent", user_key: str) -> tuple:
+        # 封包帶有訊息 id 時以它為準：只擋真正重送的同一封包，
+        # 前後兩次數量相同的獨立連擊不會被誤判；沒有 id 才退回 (user, gift_id, repeat_count)
+        msg_id = getattr(getattr(evt, "base_message", None), "message_id", None)
+        if msg_id:
+            return ("msg", msg_id)
+        return (user_key, evt.gift.id, evt.repeat_count)
+
+    def _is_duplicate_gift(self, key: tuple) -> bool:
+        now = time.monotonic()
+        ts = self._recent_gift_keys.get(key)
+        if ts is not None and now - ts < self._DEDUP_WINDOW:
+            return True
+        self._recent_gift_keys[key] = now
+        self._recent_gift_keys.move_to_end(key)
+        while len(self._recent_gift_keys) > self._DEDUP_MAX:
+            self._recent_gift_keys.popitem(last=False)
+        return False
+
+    def _queue_trigger(self, key: Tuple[str, int, str], count: int, session: int):
+        # 在事件圈內呼叫：第一次出現時排程 flush，視窗內的後續觸發只累加次數
+        entry = self._combo_accumulator.get(key)
+        if entry is not None:
+            entry[0] += count
+            return
+        self._combo_accumulator[key] = [count, self.interrupt_on_gift, session]
+        asyncio.get_running_loop().call_later(self._COMBO_WINDOW, self._flush_combo, key)
+
+    def _flush_combo(self, key: Tuple[str, int, str]):
+        entry = self._combo_accumulator.pop(key, None)
+        if entry is None:
+            return
+        count, interrupt, session = entry
+        # 舊 session 的累積直接丟棄
+        if self.running and session == self._session_id:
+            self.on_video_triggered.emit(key[2], interrupt, count)
+
     def _unsafe_cleanup(self):
         # 僅供內部呼叫：清理欄位，不發 signal
         self.client = None
-        self.thread = None
+        self._future = None
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None or not self._loop_thread or not self._loop_thread.is_alive():
+            self._loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+            self._loop_thread.start()
+        return self._loop
+
+    async def _stop_client(self, client, future):
+        try:
+            if client is not None:
+                await asyncio.wait_for(self._shutdown_client(client), timeout=2.0)
+        except OSError as e:
+            if "[WinError 6]" in str(e):
+                print("[INFO] 捕捉到良性的網路控制代碼關閉錯誤，已忽略。")
+            else:
+                self._post_event({"type": "LOG", "tag": "WARN", "message": f"停止 client 時發生 OSError: {e}"})
+        except Exception as e:
+            self._post_event({"type": "LOG", "tag": "WARN", "message": f"停止 client 時發生錯誤: {e}"})
+        finally:
+            # 連線協程可能卡在重試等待中，直接取消
+            if future is not None and not future.done():
+                future.cancel()
+
+    @staticmethod
+    async def _shutdown_client(client):
+        # 不同版本 TikTokLive 的 disconnect()/stop() 可能是協程也可能是一般函式
+        closer = getattr(client, "disconnect", None) or getattr(client, "stop", None)
+        if closer is None:
+            return
+        result = closer()
+        if asyncio.isfuture(result) or asyncio.iscoroutine(result):
+            await result
+
+    def set_gift_map(self, items: List[GiftMapItem]):
+        """整份替換 gift_map 並重建索引；外部請用這個取代直接指派 gift_map。"""
+        self.gift_map = items
+        self._rebuild_indexes()
+        _invalidate_path_exists_cache()
+
+    def _rebuild_indexes(self):
+        """依 gift_map 重建 gid -> item 字典與 (kw casefold, item) 清單；同 gid 以第一筆為準。"""
+        gid_index: Dict[str, GiftMapItem] = {}
+        kw_index: List[Tuple[str, GiftMapItem]] = []
+        for item in self.gift_map:
+            gid = str(item.get("gid", ""))
+            if gid and gid not in gid_index:
+                gid_index[gid] = item
+            kw = (item.get("kw") or "").casefold()
+            if kw:
+                kw_index.append((kw, item))
+        automaton = None
+        if _HAS_AHOCORASICK and len(kw_index) >= self._AC_MIN_KEYWORDS:
+            try:
+                automaton = ahocorasick.Automaton()
+                for order, (kw, item) in enumerate(kw_index):
+                    if not automaton.exists(kw):  # 同 kw 以第一筆為準
+                        automaton.add_word(kw, (order, item))
+                automaton.make_automaton()
+            except Exception:
+                automaton = None  # 建構失敗就退回逐一比對
+        # 整批替換，避免監聽執行緒讀到一半的索引
+        self._gid_index = gid_index
+        self._kw_index = kw_index
+        self._kw_automaton = automaton
 
     def _find_gift_map_match(self, gift_name: str, gift_id: int) -> Optional[GiftMapItem]:
         if not gift_name:
             return None
-        text = gift_name.lower()
         if gift_id:
-            for item in self.gift_map:
-                if str(item.get("gid", "")) == str(gift_id):
-                    return item
-        for item in self.gift_map:
-            kw = item.get("kw", "").lower()
-            if kw and kw in text:
+            item = self._gid_index.get(str(gift_id))
+            if item is not None:
+                return item
+        text = gift_name.casefold()  # kw 在建索引時已 casefold，每個事件只轉一次
+        automaton = self._kw_automaton
+        if automaton is not None:
+            # 單次掃描找出所有命中；取 gift_map 中順位最前者，與逐一比對結果一致
+            best = None
+            for _, (order, item) in automaton.iter(text):
+                if best is None or order < best[0]:
+                    best = (order, item)
+            return best[1] if best else None
+        for kw, item in self._kw_index:
+            if kw in text:
                 return item
         return None
 
-    def _run_client(self, username: str, api_key: str, session: int):
+    async def _run_client(self, username: str, api_key: str, session: int):
         # 簡單自動重連（指數退避），避免「冷清就斷」後需要手動點開始
         backoff = 1.0
         MAX_BACKOFF = 30.0
@@ -420,18 +943,25 @@ class TikTokListener(QObject):
             # 僅當前 session 且 running 才處理事件
             return self.running and (session == self._session_id)
 
+        if not _require_tiktoklive():
+            self._post_event({"type": "LOG", "tag": "ERROR", "message": "錯誤: 'TikTokLive' 函式庫載入失敗"})
+            if still_valid():
+                self.on_status_change.emit("已停止")
+            return
+
         while still_valid():
+            client = None
             try:
                 if WebDefaults:
                     WebDefaults.tiktok_sign_api_key = api_key
 
-                self.client = TikTokLiveClient(unique_id=f"@{username}")
+                client = self.client = TikTokLiveClient(unique_id=f"@{username}")
 
                 @self.client.on(ConnectEvent)
                 async def on_connect(_: ConnectEvent):
                     if not still_valid():
                         return
-                    self.on_event_received.emit({
+                    self._post_event({
                         "type": "LOG", "tag": "INFO", "message": f"已連線至 @{username} 的直播間。"
                     })
                     self.on_status_change.emit(f"已連線: @{username}")
@@ -440,7 +970,7 @@ class TikTokListener(QObject):
                 async def on_disconnect(_: DisconnectEvent):
                     if not still_valid():
                         return
-                    self.on_event_received.emit({
+                    self._post_event({
                         "type": "LOG", "tag": "INFO", "message": "已從直播間斷線。"
                     })
                     self.on_status_change.emit("已斷線")
@@ -449,9 +979,7 @@ class TikTokListener(QObject):
                 async def on_comment(evt: CommentEvent):
                     if not still_valid():
                         return
-                    self.on_event_received.emit({
-                        "type": "COMMENT", "user": evt.user.nickname, "message": evt.comment
-                    })
+                    self._post_event(CommentEv(evt.user.nickname, evt.comment))
 
                 @self.client.on(GiftEvent)
                 async def on_gift(evt: GiftEvent):
@@ -461,93 +989,95 @@ class TikTokListener(QObject):
                     # combo 未結束時不重複觸發
                     if gift.combo and not evt.repeat_end:
                         return
-                    self.on_event_received.emit({
-                        "type": "GIFT",
-                        "user": evt.user.nickname,
-                        "gift_name": gift.name,
-                        "count": evt.repeat_count
-                    })
+                    user_key = getattr(evt.user, "unique_id", None) or evt.user.nickname
+                    # 非 combo 禮物的 repeat_count 恆為 1，連送兩次是兩份真實禮物，不能去重
+                    if gift.combo and self._is_duplicate_gift(self._gift_dedup_key(evt, user_key)):
+                        return
+                    self._post_event(GiftEv(evt.user.nickname, gift.name, evt.repeat_count))
                     self.on_status_change.emit(f"收到禮物: {gift.name} x{evt.repeat_count}")
 
-                    match = self._find_gift_map_match(gift.name, gift.id)
+                    # 沒有任何映射也沒有可用的後備影片時，記錄完事件就結束
+                    has_map = bool(self._gid_index or self._kw_index)
+                    if not (has_map or self._fallback_exists):
+                        return
+
+                    match = self._find_gift_map_match(gift.name, gift.id) if has_map else None
                     if match:
                         path = match.get("path")
-                        if path and os.path.exists(path):
-                            self.on_event_received.emit({
+                        if path and _path_exists_cached(path):
+                            self._post_event({
                                 "type": "LOG",
                                 "tag": "DEBUG",
                                 "message": f"匹配成功: {gift.name} -> {os.path.basename(path)}"
                             })
-                            # 核心：僅在有效 session 下發射觸發
+                            # 核心：僅在有效 session 下觸發；短時間內的連擊合併成一次
                             if still_valid():
-                                self.on_video_triggered.emit(path, self.interrupt_on_gift, evt.repeat_count)
+                                self._queue_trigger((user_key, gift.id, path), evt.repeat_count, session)
                         else:
-                            self.on_event_received.emit({
+                            self._post_event({
                                 "type": "LOG", "tag": "WARN", "message": f"匹配成功但檔案不存在: {path}"
                             })
-                    elif self.fallback_video_path and os.path.exists(self.fallback_video_path):
-                        self.on_event_received.emit({
+                    elif self._fallback_exists:
+                        self._post_event({
                             "type": "LOG", "tag": "DEBUG", "message": "無匹配，播放後備影片。"
                         })
                         if still_valid():
-                            self.on_video_triggered.emit(self.fallback_video_path, self.interrupt_on_gift, evt.repeat_count)
+                            self._queue_trigger(
+                                (user_key, gift.id, self.fallback_video_path), evt.repeat_count, session
+                            )
 
                 @self.client.on(LikeEvent)
                 async def on_like(event: LikeEvent):
                     if not still_valid():
                         return
-                    self.on_event_received.emit({
-                        "type": "LIKE", "user": event.user.nickname, "count": event.count
-                    })
+                    self._post_like(event.user.nickname, event.count)
 
                 @self.client.on(JoinEvent)
                 async def on_join(event: JoinEvent):
                     if not still_valid():
                         return
-                    self.on_event_received.emit({
-                        "type": "JOIN", "user": event.user.nickname
-                    })
+                    self._post_event(JoinEv(event.user.nickname))
 
                 @self.client.on(FollowEvent)
                 async def on_follow(event: FollowEvent):
                     if not still_valid():
                         return
-                    self.on_event_received.emit({
-                        "type": "FOLLOW", "user": event.user.nickname
-                    })
+                    self._post_event(FollowEv(event.user.nickname))
 
-                # 執行，直到正常結束或丟例外
-                self.client.run()
+                # 在常駐事件圈內連線，直到正常結束或丟例外
+                await client.connect()
 
                 # 若是正常返回（例如遠端關閉），嘗試依退避策略重連
                 if not still_valid():
                     break
-                self.on_event_received.emit({
+                self._post_event({
                     "type": "LOG", "tag": "INFO", "message": f"連線結束，{int(backoff)} 秒後自動重試..."
                 })
-                time.sleep(backoff)
+                await asyncio.sleep(backoff)
                 backoff = min(MAX_BACKOFF, max(1.0, backoff * 2))
             except Exception as e:
                 if not still_valid():
                     break
-                self.on_event_received.emit({
+                self._post_event({
                     "type": "LOG", "tag": "ERROR", "message": f"TikTok 連線失敗: {e}，{int(backoff)} 秒後重試。"
                 })
                 self.on_status_change.emit("連線錯誤")
-                time.sleep(backoff)
+                await asyncio.sleep(backoff)
                 backoff = min(MAX_BACKOFF, max(1.0, backoff * 2))
             finally:
-                # 保險：嘗試停止並清理 client 實例
-                try:
-                    if self.client:
-                        self.client.stop()
-                except Exception:
-                    pass
-                self.client = None
-
-        # 跳出重連迴圈
-        self.running = False
-        self.on_status_change.emit("已停止")
+                # 保險：嘗試停止並清理 client 實例（只清自己這一輪建立的）
+                if client is not None:
+                    try:
+                        await self._shutdown_client(client)
+                    except Exception:
+                        pass
+                    if self.client is client:
+                        self.client = None
+
+        # 跳出重連迴圈；若已有新的 session 接手，就不要覆寫它的狀態
+        if session == self._session_id:
+            self.running = False
+            self.on_status_change.emit("已停止")
 
 
 # ==================== FIFO 佇列 ==========================
@@ -558,7 +1088,9 @@ class PlayQueueFIFO(QObject):
     def __init__(self, maxlen: Optional[int] = None):
         super().__init__()
         self._q = deque()
-        self._lock = threading.RLock()
+        # 一般 Lock 即可：持鎖期間只做 deque 操作，不會重入；
+        # _mon 一律在釋放鎖之後呼叫，因為同執行緒的 queue_changed 槽會直接回呼 snapshot()
+        self._lock = threading.Lock()
         self._maxlen = int(maxlen) if maxlen and maxlen > 0 else None
 
     def _mon(self, op, caller, size, note):
@@ -567,20 +1099,27 @@ class PlayQueueFIFO(QObject):
 
     def enqueue(self, job_path: str, repeat: int = 1, note: str = ""):
         item = (job_path, str(note or ""))
+        times = max(1, repeat or 1)
         with self._lock:
-            for _ in range(max(1, repeat or 1)):
-                if self._maxlen and len(self._q) >= self._maxlen:
+            if self._maxlen:
+                # 先一次丟掉會被擠出的最舊項目，再整批 extend（C 層迴圈）
+                n = min(times, self._maxlen)
+                for _ in range(max(0, len(self._q) + n - self._maxlen)):
                     self._q.popleft()
-                self._q.append(item)
-            self._mon("push", "enqueue", len(self._q), f"{note} x{max(1, repeat or 1)}")
+            else:
+                n = times
+            self._q.extend((item,) * n)
+            size = len(self._q)
+        self._mon("push", "enqueue", size, f"{note} x{times}")
 
     def pop_next(self) -> Optional[tuple[str, str]]:
         with self._lock:
             if not self._q:
                 return None
             job = self._q.popleft()
-            self._mon("pop", "pop_next", len(self._q), job[1])
-            return job
+            size = len(self._q)
+        self._mon("pop", "pop_next", size, job[1])
+        return job
 
     def snapshot(self) -> list[tuple[str, str]]:
         with self._lock:
@@ -589,7 +1128,7 @@ class PlayQueueFIFO(QObject):
     def clear(self):
         with self._lock:
             self._q.clear()
-            self._mon("clear", "clear", 0, "")
+        self._mon("clear", "clear", 0, "")
 
     def __len__(self):
         with self._lock:
@@ -605,8 +1144,11 @@ class PlayerWrapper(QObject):
         super().__init__()
         self._on_log = on_log
         self._desired_volume = 100
+        # 最近一次送進 mpv 的 mute/音量；相同值不再重送指令
+        self._muted: Optional[bool] = None
+        self._applied_volume: Optional[int] = None
 
-        if _HAS_MPV:
+        if _require_mpv() is not None:
             try:
                 self._p = mpv.MPV(
                     wid=int(video_container.winId()),
@@ -629,6 +1171,7 @@ class PlayerWrapper(QObject):
                     # 統一用 command，避免某些 build 下 set_property 不穩
                     try:
                         self._p.command("set", "volume", str(self._desired_volume))
+                        self._applied_volume = self._desired_volume
                     except MPV_CALL_ERRORS as e:
                         self._on_log(f"[MPV] set volume on file-loaded failed: {e}")
 
@@ -639,56 +1182,72 @@ class PlayerWrapper(QObject):
         else:
             self._p, self._backend = None, "mock"
 
+        # 預先綁定 mpv 方法，每次控制指令不必再 getattr + callable 檢查；mock 後端為 None
+        p = self._p
+        self._cmd = p.command if p else None
+        self._set = p.set_property if p else None
+        self._get = p.get_property if p else None
+        self._term = p.terminate if p else None
+
     def _on_end_file(self, event):
-        reason_str = ""
         try:
-            reason = getattr(getattr(event, 'data', None), 'reason', None)
-            if reason is not None:
-                if isinstance(reason, (str, bytes)):
-                    reason_str = reason.decode(
-                        'utf-8') if isinstance(reason, bytes) else reason
-                elif isinstance(reason, int):
-                    reason_str = str(reason)
-                elif hasattr(reason, 'value'):
-                    reason_str = str(reason.value)
-                else:
-                    reason_str = str(reason)
-        except Exception:
-            pass
+            reason = event.data.reason
+        except AttributeError:
+            return
+        # 快速路徑：新版 python-mpv 的 reason 是 int（或 IntEnum），0 = EOF
+        if isinstance(reason, int):
+            if reason == 0:
+                self.playback_ended.emit()
+            return
+        # 慢速路徑：舊版以字串/bytes 或帶 .value 的物件表示
+        if isinstance(reason, bytes):
+            reason_str = reason.decode('utf-8', 'ignore')
+        elif hasattr(reason, 'value'):
+            reason_str = str(reason.value)
+        else:
+            reason_str = str(reason)
         reason_str = reason_str.lower().strip()
         if reason_str == 'eof' or reason_str == '0':
             self.playback_ended.emit()
 
-    def _safe_call(self, method_name: str, *args):
-        if not self._p:
+    def _log_call_failed(self, method_name: str, args: tuple, e: Exception):
+        self._on_log(
+            f"[{self._backend.upper()}] call failed: {method_name} with {args} ({e})"
+        )
+
+    def command(self, *args):
+        if self._cmd is None:
             return
         try:
-            method = getattr(self._p, method_name)
-            if callable(method):
-                return method(*args)
+            self._cmd(*args)
         except MPV_CALL_ERRORS as e:
-            self._on_log(
-                f"[{self._backend.upper()}] call failed: {method_name} with {args} ({e})"
-            )
-
-    def command(self, *args):
-        self._safe_call("command", *args)
+            self._log_call_failed("command", args, e)
 
     def set_property(self, name, value):
-        self._safe_call("set_property", name, value)
+        if self._set is None:
+            return
+        try:
+            self._set(name, value)
+        except MPV_CALL_ERRORS as e:
+            self._log_call_failed("set_property", (name, value), e)
 
     def get_property(self, name):
-        if not self._p:
+        if self._get is None:
             return None
         try:
-            return self._p.get_property(name)
+            return self._get(name)
         except MPV_CALL_ERRORS:
             self._on_log(
                 f"[{self._backend.upper()}] get_property failed: {name}")
             return None
 
     def terminate(self):
-        self._safe_call("terminate")
+        if self._term is None:
+            return
+        try:
+            self._term()
+        except MPV_CALL_ERRORS as e:
+            self._log_call_failed("terminate", (), e)
 
     def set_loop(self, times: int):
         if times == 1:
@@ -700,8 +1259,12 @@ class PlayerWrapper(QObject):
         self.command("set", "loop", loop_value)
 
     def set_mute(self, muted: bool = True):
+        muted = bool(muted)
+        if self._muted == muted:
+            return
         try:
             self.command("set", "mute", "yes" if muted else "no")
+            self._muted = muted
         except MPV_CALL_ERRORS as e:
             self._on_log(f"[MPV] set mute failed: {e}")
 
@@ -709,8 +1272,11 @@ class PlayerWrapper(QObject):
     def set_volume(self, volume: int):
         vol = max(0, min(150, int(volume)))
         self._desired_volume = vol
+        if self._applied_volume == vol:
+            return
         try:
             self.command("set", "volume", str(vol))
+            self._applied_volume = vol
         except MPV_CALL_ERRORS as e:
             self._on_log(f"[MPV] set volume failed: {e}")
 
@@ -735,6 +1301,18 @@ class ResizableVideoFrame(QFrame):
         self._start_pos = QPointF()
         self._start_geom = self.geometry()
         self._is_editing = False
+        # 拖曳時的版面通知合併成每 ~16ms 最多一次，放開滑鼠時立即送出最後一筆
+        self._pending_rect: Optional[QRect] = None
+        self._emit_timer = QTimer(self)
+        self._emit_timer.setSingleShot(True)
+        self._emit_timer.setInterval(16)
+        self._emit_timer.timeout.connect(self._flush_layout)
+
+    def _flush_layout(self):
+        self._emit_timer.stop()
+        rect, self._pending_rect = self._pending_rect, None
+        if rect is not None:
+            self.layout_changed_by_user.emit(rect)
 
     def set_editing(self, is_editing: bool):
         self._is_editing = is_editing
@@ -813,7 +1391,9 @@ class ResizableVideoFrame(QFrame):
             # 限制在父視窗內容區域內
             new_rect = self._bounded_rect(new_rect)
             self.setGeometry(new_rect)
-            self.layout_changed_by_user.emit(new_rect)
+            self._pending_rect = new_rect
+            if not self._emit_timer.isActive():
+                self._emit_timer.start()
         else:
             self.set_cursor_for_pos(event.position())
         event.accept()
@@ -822,6 +1402,7 @@ class ResizableVideoFrame(QFrame):
         if not self._is_editing:
             return
         self._is_dragging = False
+        self._flush_layout()
         self.set_cursor_for_pos(event.position())
         event.accept()
 
@@ -931,40 +1512,25 @@ class GiftMapDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle("編輯禮物映射")
         self.item = item or {}
-        library_paths = library_paths or []
-        gift_list = gift_list or []
+        # 下拉選單延到對話框顯示後（事件迴圈第一輪）才填入，讓視窗先畫出來
+        self._library_paths = library_paths or []
+        self._gift_list = gift_list or []
+        # 目前下拉選單裡實際填入的清單；對話框重複使用時，清單沒變就不重填
+        self._filled_gifts: Optional[List[GiftInfo]] = None
+        self._filled_paths: Optional[List[str]] = None
+        self._name_to_idx: Dict[str, int] = {}
+        self._id_to_idx: Dict[str, int] = {}
         layout = QVBoxLayout(self)
 
         gift_layout = QHBoxLayout()
         gift_layout.addWidget(QLabel("禮物:"))
         self.gift_combo = QComboBox()
-        for gift in gift_list:
-            display_text = f"{gift.get('name_cn', '')} ({gift.get('name_en', '')})"
-            self.gift_combo.addItem(display_text, userData=gift)
-
-        current_kw = self.item.get("kw", "")
-        current_gid = self.item.get("gid", "")
-        if current_kw or current_gid:
-            for i in range(self.gift_combo.count()):
-                gift_data = self.gift_combo.itemData(i)
-                if (gift_data.get("name_en") == current_kw
-                        or gift_data.get("id") == current_gid):
-                    self.gift_combo.setCurrentIndex(i)
-                    break
         gift_layout.addWidget(self.gift_combo)
         layout.addLayout(gift_layout)
 
         path_layout = QHBoxLayout()
         path_layout.addWidget(QLabel("影片路徑:"))
         self.path_combo = QComboBox()
-        for path in library_paths:
-            self.path_combo.addItem(os.path.basename(path), userData=path)
-
-        current_path = self.item.get("path", "")
-        if current_path:
-            index = self.path_combo.findData(current_path)
-            if index >= 0:
-                self.path_combo.setCurrentIndex(index)
         path_layout.addWidget(self.path_combo)
         layout.addLayout(path_layout)
 
@@ -983,6 +1549,50 @@ class GiftMapDialog(QDialog):
         buttons.rejected.connect(self.reject)
         layout.addWidget(buttons)
 
+        QTimer.singleShot(0, self._populate_combos)
+
+    def populate(self,
+                 item: Optional[GiftMapItem] = None,
+                 library_paths: Optional[List[str]] = None,
+                 gift_list: Optional[List[GiftInfo]] = None):
+        """重複使用同一個對話框：換上新的項目與清單後，只重填有變動的下拉選單。"""
+        self.item = item or {}
+        self._library_paths = library_paths or []
+        self._gift_list = gift_list or []
+        self._populate_combos()
+
+    def _populate_combos(self):
+        if self._filled_gifts != self._gift_list:
+            # 填入期間擋住 currentIndexChanged，避免每加一項就觸發一次槽
+            # 邊填邊建 name_en / id -> 索引（同鍵取第一筆），預選時不必再逐項 itemData()
+            self._name_to_idx, self._id_to_idx = {}, {}
+            with QSignalBlocker(self.gift_combo):
+                self.gift_combo.clear()
+                for i, gift in enumerate(self._gift_list):
+                    display_text = f"{gift.get('name_cn', '')} ({gift.get('name_en', '')})"
+                    self.gift_combo.addItem(display_text, userData=gift)
+                    self._name_to_idx.setdefault(gift.get("name_en", ""), i)
+                    self._id_to_idx.setdefault(str(gift.get("id", "")), i)
+            self._filled_gifts = list(self._gift_list)
+
+        current_kw = self.item.get("kw", "")
+        current_gid = str(self.item.get("gid", "") or "")
+        candidates = [idx for idx in (self._name_to_idx.get(current_kw) if current_kw else None,
+                                      self._id_to_idx.get(current_gid) if current_gid else None)
+                      if idx is not None]
+        self.gift_combo.setCurrentIndex(min(candidates) if candidates else min(0, self.gift_combo.count() - 1))
+
+        if self._filled_paths != self._library_paths:
+            with QSignalBlocker(self.path_combo):
+                self.path_combo.clear()
+                for path in self._library_paths:
+                    self.path_combo.addItem(_basename(path), userData=path)
+            self._filled_paths = list(self._library_paths)
+
+        current_path = self.item.get("path", "")
+        index = self.path_combo.findData(current_path) if current_path else -1
+        self.path_combo.setCurrentIndex(index if index >= 0 else min(0, self.path_combo.count() - 1))
+
     def get_data(self) -> GiftMapItem:
         selected_gift_index = self.gift_combo.currentIndex()
         gift_data = self.gift_combo.itemData(
@@ -1003,6 +1613,10 @@ class GiftsTab(QWidget):
     封裝「TikTok 禮物設定」分頁的 UI 與互動邏輯。
     (新版：統一管理連線、翻譯、朗讀的所有相關設定)
     """
+    # 單筆映射異動 (舊項目或 None, 新項目或 None)，讓 MainWindow 增量維護索引
+    gift_map_item_changed = Signal(object, object)
+
+    _GIFT_TREE_REFRESH_MS = 100
 
     def __init__(self,
                  owner: 'MainWindow',
@@ -1018,6 +1632,13 @@ class GiftsTab(QWidget):
         self.get_library_paths = get_library_paths
         self._log = log_func
         self.playback_volume = 100
+        # 映射樹重建合併：短時間內多次呼叫 _refresh_gift_tree 只重建一次
+        self._gift_tree_dirty_timer = QTimer(self)
+        self._gift_tree_dirty_timer.setSingleShot(True)
+        self._gift_tree_dirty_timer.setInterval(self._GIFT_TREE_REFRESH_MS)
+        self._gift_tree_dirty_timer.timeout.connect(self._do_refresh_gift_tree)
+        self._last_gift_tree_snapshot: Optional[list] = None
+        self._gift_dialog: Optional[GiftMapDialog] = None
         self._build_ui()
 
     def _build_ui(self):
@@ -1056,6 +1677,9 @@ class GiftsTab(QWidget):
         self.gift_tree = QTreeWidget()
         self.gift_tree.setColumnCount(2)
         self.gift_tree.setHeaderLabels(["礼物", "影片路径"])
+        # 第一欄固定初始寬度（可手動拖曳），避免每次刷新都逐項量測文字寬度
+        self.gift_tree.header().setSectionResizeMode(0, QHeaderView.ResizeMode.Interactive)
+        self.gift_tree.setColumnWidth(0, 260)
         self.gift_tree.header().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
         map_layout.addWidget(self.gift_tree)
         map_btn_layout = QHBoxLayout()
@@ -1095,8 +1719,6 @@ class GiftsTab(QWidget):
         self.volume_spinbox = QSpinBox()
         self.volume_spinbox.setRange(0, 150)
         self.volume_spinbox.setValue(100)
-        self.volume_slider.valueChanged.connect(self.volume_spinbox.setValue)
-        self.volume_spinbox.valueChanged.connect(self.volume_slider.setValue)
         volume_layout.addWidget(self.volume_slider)
         volume_layout.addWidget(self.volume_spinbox)
         playback_layout.addLayout(volume_layout)
@@ -1168,24 +1790,30 @@ class GiftsTab(QWidget):
         btn_add_gift.clicked.connect(self._add_gift_map)
         btn_edit_gift.clicked.connect(self._edit_gift_map)
         btn_del_gift.clicked.connect(self._remove_gift_map)
-        btn_manage_gifts.clicked.connect(lambda: self.main._manage_gift_list())
+        btn_manage_gifts.clicked.connect(self.main._manage_gift_list)
         btn_pick_fallback.clicked.connect(self._pick_fallback_video)
 
         # 所有設定變更都觸發儲存
         self.tiktok_url_entry.editingFinished.connect(self.main._save_gift_map)
         self.tiktok_api_key_entry.editingFinished.connect(self.main._save_gift_map)
         self.gemini_api_key_edit.editingFinished.connect(self.main._save_gift_map)
+        self.fallback_video_entry.textChanged.connect(self.listener.set_fallback_video_path)
         self.fallback_video_entry.textChanged.connect(self.main._save_gift_map)
         self.interrupt_checkbox.toggled.connect(self.main._save_gift_map)
-        self.volume_spinbox.valueChanged.connect(self._on_volume_changed)
+        self._wire_volume()
         self.read_comment_checkbox.toggled.connect(self.main._save_gift_map)
         self.tts_filter_checkbox.toggled.connect(self.main._save_gift_map)
         self.tts_filter_edit.editingFinished.connect(self.main._save_gift_map)
         self.tts_truncate_checkbox.toggled.connect(self.main._save_gift_map)
         self.translate_checkbox.toggled.connect(self.main._save_gift_map)
         self.show_original_comment_checkbox.toggled.connect(self.main._save_gift_map)
+        # 留言處理用的選項快取（見 MainWindow._sync_comment_options）
+        for cb in (self.read_comment_checkbox, self.tts_filter_checkbox,
+                   self.tts_truncate_checkbox, self.show_original_comment_checkbox):
+            cb.toggled.connect(self.main._sync_comment_options)
+        self.tts_filter_edit.textChanged.connect(self.main._sync_comment_options)
         self.gemini_model_combo.currentIndexChanged.connect(self.main._save_gift_map)
-        self.btn_reload_models.clicked.connect(lambda: self.main._refresh_gemini_models_async())
+        self.btn_reload_models.clicked.connect(self.main._refresh_gemini_models_async)
 
     def _start_tiktok_listener(self):
         url = self.tiktok_url_entry.text().strip()
@@ -1206,71 +1834,176 @@ class GiftsTab(QWidget):
         self.tiktok_status_label.setText("状态: 已停止")
 
     def _refresh_gift_tree(self):
-        self.gift_tree.clear()
-        gift_name_map = {g.get("name_en"): g.get("name_cn", g.get("name_en")) for g in
-                         self.gift_manager.get_all_gifts()}
-        for item in self.listener.gift_map:
-            kw, gid, path = item.get("kw", ""), item.get("gid", ""), item.get("path", "")
-            display_name = gift_name_map.get(kw, kw)
-            id_str = f"(ID: {gid})" if gid else ""
-            tree_item = QTreeWidgetItem([f"{display_name} {id_str}".strip(), os.path.basename(path) if path else "N/A"])
-            if not path or not os.path.exists(path):
-                tree_item.setForeground(1, QColor("red"))
-                tree_item.setToolTip(1, f"檔案不存在或未設定！\n路徑: {path}")
+        # 只標記為需要重建，實際工作延到計時器到期時做一次
+        self._gift_tree_dirty_timer.start()
+
+    def _gift_tree_stale(self) -> bool:
+        # 有重建在排程中時，樹上的項目可能與 gift_map 不一致，不可用來對應索引
+        return self._gift_tree_dirty_timer.isActive()
+
+    def _flush_gift_tree(self, tree_item: Optional[QTreeWidgetItem]) -> Optional[QTreeWidgetItem]:
+        """有重建在排程中時立刻同步重建，並回傳重建後同一列的項目（舊項目可能已被刪除）。"""
+        if tree_item is None or not self._gift_tree_stale():
+            return tree_item
+        row = self.gift_tree.indexOfTopLevelItem(tree_item)
+        self._do_refresh_gift_tree()
+        fresh = self.gift_tree.topLevelItem(row) if row >= 0 else None
+        if fresh is not None:
+            self.gift_tree.setCurrentItem(fresh)
+        return fresh
+
+    def _gift_map_index_of(self, tree_item: Optional[QTreeWidgetItem]) -> int:
+        """樹項目對應的 gift_map 索引（呼叫端需先以 _flush_gift_tree 取得最新項目）；沒有選取時回傳 -1。"""
+        if tree_item is None or self._gift_tree_stale():
+            return -1
+        index = tree_item.data(0, Qt.ItemDataRole.UserRole)
+        if not isinstance(index, int) or not 0 <= index < len(self.listener.gift_map):
+            return -1
+        return index
+
+    @staticmethod
+    def _gift_tree_row(item: GiftMapItem, get_name: Callable[[str, str], str]) -> Tuple[str, str, bool]:
+        kw, gid, path = item.get("kw", ""), item.get("gid", ""), item.get("path", "")
+        display_name = get_name(kw, kw)
+        id_str = f"(ID: {gid})" if gid else ""
+        return f"{display_name} {id_str}".strip(), path, bool(path) and _path_exists_cached(path)
+
+    @staticmethod
+    def _make_gift_tree_item(index: int, row: Tuple[str, str, bool]) -> QTreeWidgetItem:
+        label, path, exists = row
+        tree_item = QTreeWidgetItem([label, _basename(path) if path else "N/A"])
+        # 記下對應 gift_map 的位置，選取時直接取回，不依賴樹上的列序
+        tree_item.setData(0, Qt.ItemDataRole.UserRole, index)
+        if not exists:
+            tree_item.setForeground(1, _MISSING_FILE_BRUSH)
+            tree_item.setToolTip(1, f"檔案不存在或未設定！\n路徑: {path}")
+        return tree_item
+
+    def _do_refresh_gift_tree(self):
+        self._gift_tree_dirty_timer.stop()
+        get_name = self.gift_manager.get_name_index().get
+        rows = [self._gift_tree_row(item, get_name) for item in self.listener.gift_map]
+        # 內容與上次相同就不動樹，連同選取與捲動位置一起保留
+        if rows == self._last_gift_tree_snapshot:
+            return
+        self._last_gift_tree_snapshot = rows
+
+        # 先在樹外建好所有項目，再一次插入，避免每筆都觸發重繪/排版
+        items = [self._make_gift_tree_item(index, row) for index, row in enumerate(rows)]
+
+        tree = self.gift_tree
+        sorting = tree.isSortingEnabled()
+        tree.setUpdatesEnabled(False)
+        tree.setSortingEnabled(False)
+        try:
+            tree.clear()
+            tree.insertTopLevelItems(0, items)
+        finally:
+            tree.setSortingEnabled(sorting)
+            tree.setUpdatesEnabled(True)
+
+    def _can_patch_gift_tree(self, expected_rows: int) -> bool:
+        # 單列快速更新的前提：樹與快照都是最新、且列序就是 gift_map 的順序
+        snapshot = self._last_gift_tree_snapshot
+        return (not self._gift_tree_stale() and not self.gift_tree.isSortingEnabled()
+                and snapshot is not None and len(snapshot) == expected_rows
+                and self.gift_tree.topLevelItemCount() == expected_rows)
+
+    def _patch_gift_tree_row(self, index: int, removed: bool = False):
+        """gift_map[index] 剛被新增/修改/刪除後，只更新樹上對應的那一列；條件不符時退回整份重建。"""
+        gift_map = self.listener.gift_map
+        if removed:
+            if not self._can_patch_gift_tree(len(gift_map) + 1):
+                self._refresh_gift_tree()
+                return
+            self.gift_tree.takeTopLevelItem(index)
+            del self._last_gift_tree_snapshot[index]
+            # 後面各列在 gift_map 中的位置都往前移一格
+            for i in range(index, len(gift_map)):
+                self.gift_tree.topLevelItem(i).setData(0, Qt.ItemDataRole.UserRole, i)
+            return
+
+        appended = index == len(gift_map) - 1 and self.gift_tree.topLevelItemCount() == index
+        if not self._can_patch_gift_tree(len(gift_map) - 1 if appended else len(gift_map)):
+            self._refresh_gift_tree()
+            return
+        row = self._gift_tree_row(gift_map[index], self.gift_manager.get_name_index().get)
+        tree_item = self._make_gift_tree_item(index, row)
+        if appended:
+            self._last_gift_tree_snapshot.append(row)
             self.gift_tree.addTopLevelItem(tree_item)
-        self.gift_tree.resizeColumnToContents(0)
+        else:
+            self._last_gift_tree_snapshot[index] = row
+            self.gift_tree.takeTopLevelItem(index)
+            self.gift_tree.insertTopLevelItem(index, tree_item)
+        self.gift_tree.setCurrentItem(tree_item)
+
+    def _gift_map_dialog(self, item: Optional[GiftMapItem], library_paths: List[str]) -> GiftMapDialog:
+        # 第一次才建立，之後重複使用同一個對話框，只換內容
+        gift_list = self.gift_manager.get_all_gifts()
+        if self._gift_dialog is None:
+            self._gift_dialog = GiftMapDialog(self, item=item, library_paths=library_paths, gift_list=gift_list)
+        else:
+            self._gift_dialog.populate(item, library_paths, gift_list)
+        return self._gift_dialog
 
     def _add_gift_map(self):
         library_paths = self.get_library_paths()
         if not library_paths:
             QMessageBox.warning(self, "提示", "媒體庫是空的，請先加入一些影片。")
             return
-        dialog = GiftMapDialog(self, library_paths=library_paths, gift_list=self.gift_manager.get_all_gifts())
+        dialog = self._gift_map_dialog(None, library_paths)
         if dialog.exec():
             new_data = dialog.get_data()
             if not new_data.get("path") or not (new_data.get("kw") or new_data.get("gid")):
                 QMessageBox.warning(self, "提示", "必須選擇一個禮物和一個影片檔案。")
                 return
             self.listener.gift_map.append(new_data)
-            self._refresh_gift_tree()
+            self.listener._rebuild_indexes()
+            _invalidate_path_exists_cache(new_data.get("path"))
+            self.gift_map_item_changed.emit(None, new_data)
+            self._patch_gift_tree_row(len(self.listener.gift_map) - 1)
             self.main._save_gift_map()
 
     def _edit_gift_map(self):
-        selected = self.gift_tree.currentItem()
-        if not selected: return
-        index = self.gift_tree.indexOfTopLevelItem(selected)
+        index = self._gift_map_index_of(self._flush_gift_tree(self.gift_tree.currentItem()))
         if index < 0: return
-        dialog = GiftMapDialog(self, item=self.listener.gift_map[index], library_paths=self.get_library_paths(),
-                               gift_list=self.gift_manager.get_all_gifts())
+        dialog = self._gift_map_dialog(self.listener.gift_map[index], self.get_library_paths())
         if dialog.exec():
             updated_data = dialog.get_data()
             if not updated_data.get("path") or not (updated_data.get("kw") or updated_data.get("gid")):
                 QMessageBox.warning(self, "提示", "必須選擇一個禮物和一個影片檔案。")
                 return
+            old_data = self.listener.gift_map[index]
             self.listener.gift_map[index] = updated_data
-            self._refresh_gift_tree()
+            self.listener._rebuild_indexes()
+            _invalidate_path_exists_cache(updated_data.get("path"))
+            self.gift_map_item_changed.emit(old_data, updated_data)
+            self._patch_gift_tree_row(index)
             self.main._save_gift_map()
 
     def _remove_gift_map(self):
-        selected = self.gift_tree.currentItem()
-        if not selected: return
-        index = self.gift_tree.indexOfTopLevelItem(selected)
+        selected = self._flush_gift_tree(self.gift_tree.currentItem())
+        index = self._gift_map_index_of(selected)
         if index >= 0 and QMessageBox.question(self, "確認刪除",
                                                f"確定要刪除「{selected.text(0)}」這個映射嗎？") == QMessageBox.StandardButton.Yes:
-            del self.listener.gift_map[index]
-            self._refresh_gift_tree()
+            removed = self.listener.gift_map.pop(index)
+            self.listener._rebuild_indexes()
+            self.gift_map_item_changed.emit(removed, None)
+            self._patch_gift_tree_row(index, removed=True)
             self.main._save_gift_map()
 
     def _pick_fallback_video(self):
-        path, _ = QFileDialog.getOpenFileName(self, "選擇後備影片", "", "影片檔案 (*.mp4 *.mkv *.mov *.avi)")
+        path, _ = QFileDialog.getOpenFileName(self, "選擇後備影片", "", _VIDEO_FILE_FILTER)
         if path:
+            _invalidate_path_exists_cache(path)
             self.fallback_video_entry.setText(path)
 
     def _on_gift_tree_double_clicked(self, item: QTreeWidgetItem, _):
-        index = self.gift_tree.indexOfTopLevelItem(item)
+        index = self._gift_map_index_of(self._flush_gift_tree(item))
         if index < 0: return
         path = self.listener.gift_map[index].get("path")
-        if not (path and os.path.exists(path)):
+        if not (path and _path_exists_cached(path)):
             QMessageBox.warning(self, "提示", "該映射的影片檔案不存在或未設定。")
             return
         count, ok = QInputDialog.getInt(self, "輸入播放次數", f"請輸入「{os.path.basename(path)}」的播放次數：", 1, 1, 999,
@@ -1279,35 +2012,64 @@ class GiftsTab(QWidget):
             self.main._enqueue_video_from_gift(path, False, count)
             self._log(f"已手動將「{os.path.basename(path)}」加入待播清單 {count} 次。")
 
+    def _wire_volume(self):
+        # 滑桿與數字框各自只接到 _on_volume_changed，由它同步另一個元件，
+        # 不再互相 setValue 來回觸發（每次拖動只派送一次）
+        unique = Qt.ConnectionType.UniqueConnection
+        self.volume_slider.valueChanged.connect(self._on_volume_changed, unique)
+        self.volume_spinbox.valueChanged.connect(self._on_volume_changed, unique)
+
     def _on_volume_changed(self, value: int):
+        other = self.volume_spinbox if self.sender() is self.volume_slider else self.volume_slider
+        if other.value() != value:
+            with QSignalBlocker(other):
+                other.setValue(value)
+        if value == self.playback_volume:
+            return
         self.playback_volume = value
         self.main._on_volume_changed(value)
         self.main._save_gift_map()
 
     def load_settings(self, data: dict):
-        # 分別讀取兩個 Key
-        self.tiktok_url_entry.setText(data.get("tiktok_url", ""))
-        self.tiktok_api_key_entry.setText(data.get("tiktok_api_key", ""))  # 使用 tiktok_api_key
-        self.gemini_api_key_edit.setText(data.get("gemini_api_key", ""))  # 使用 gemini_api_key
-
-        self.listener.gift_map = data.get("gift_map", [])
-        self.listener.fallback_video_path = data.get("fallback_video", "")
-        self.fallback_video_entry.setText(self.listener.fallback_video_path)
-        self.interrupt_checkbox.setChecked(data.get("interrupt_on_gift", False))
-        self.playback_volume = data.get("playback_volume", 100)
-        self.volume_slider.setValue(self.playback_volume)
-        self.read_comment_checkbox.setChecked(data.get("read_comment", False))
-        self.tts_filter_checkbox.setChecked(data.get("tts_filter_enabled", False))
-        self.tts_filter_edit.setText(data.get("tts_filter_keywords", ""))
-        self.tts_truncate_checkbox.setChecked(data.get("tts_truncate_enabled", False))
-        self.translate_checkbox.setChecked(data.get("translate_enabled", False))
-        self.show_original_comment_checkbox.setChecked(data.get("show_original", True))
-
-        model = data.get("gemini_model", "gemini-1.5-flash")
-        if self.gemini_model_combo.findData(model) == -1:
-            self.gemini_model_combo.addItem(model, userData=model)
-        self.gemini_model_combo.setCurrentIndex(self.gemini_model_combo.findData(model))
+        # 載入期間暫停各欄位的訊號：否則每個 setter 都會觸發一次存檔/音量同步，
+        # 而且中途存下的是「載入到一半」的設定。全部套用完再手動同步一次。
+        blockers = [QSignalBlocker(w) for w in (
+            self.tiktok_url_entry, self.tiktok_api_key_entry, self.gemini_api_key_edit,
+            self.fallback_video_entry, self.interrupt_checkbox, self.volume_slider, self.volume_spinbox,
+            self.read_comment_checkbox, self.tts_filter_checkbox, self.tts_filter_edit,
+            self.tts_truncate_checkbox, self.translate_checkbox, self.show_original_comment_checkbox,
+            self.gemini_model_combo,
+        )]
+        try:
+            # 分別讀取兩個 Key
+            self.tiktok_url_entry.setText(data.get("tiktok_url", ""))
+            self.tiktok_api_key_entry.setText(data.get("tiktok_api_key", ""))  # 使用 tiktok_api_key
+            self.gemini_api_key_edit.setText(data.get("gemini_api_key", ""))  # 使用 gemini_api_key
+
+            self.listener.set_gift_map(data.get("gift_map", []))
+            self.listener.fallback_video_path = data.get("fallback_video", "")
+            self.fallback_video_entry.setText(self.listener.fallback_video_path)
+            self.interrupt_checkbox.setChecked(data.get("interrupt_on_gift", False))
+            self.playback_volume = data.get("playback_volume", 100)
+            self.volume_slider.setValue(self.playback_volume)
+            self.volume_spinbox.setValue(self.playback_volume)
+            self.read_comment_checkbox.setChecked(data.get("read_comment", False))
+            self.tts_filter_checkbox.setChecked(data.get("tts_filter_enabled", False))
+            self.tts_filter_edit.setText(data.get("tts_filter_keywords", ""))
+            self.tts_truncate_checkbox.setChecked(data.get("tts_truncate_enabled", False))
+            self.translate_checkbox.setChecked(data.get("translate_enabled", False))
+            self.show_original_comment_checkbox.setChecked(data.get("show_original", True))
+
+            model = data.get("gemini_model", "gemini-1.5-flash")
+            if self.gemini_model_combo.findData(model) == -1:
+                self.gemini_model_combo.addItem(model, userData=model)
+            self.gemini_model_combo.setCurrentIndex(self.gemini_model_combo.findData(model))
+        finally:
+            for blocker in blockers:
+                blocker.unblock()
 
+        self.main._on_volume_changed(self.playback_volume)
+        self.main._sync_comment_options()
         self._refresh_gift_tree()
         self.main._on_translation_settings_changed()
 
@@ -1350,12 +2112,8 @@ class LibraryListWidget(QListWidget):
 
     def dropEvent(self, event: QDropEvent) -> None:
         if event.mimeData().hasUrls():
-            urls = event.mimeData().urls()
-            exts = ('.mp4', '.mkv', '.mov', '.avi')
-            files = [
-                url.toLocalFile() for url in urls
-                if url.isLocalFile() and url.toLocalFile().lower().endswith(exts)
-            ]
+            local = (url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile())
+            files = [f for f in local if _is_video_file(f)]
             if files:
                 self.filesDropped.emit(files)
                 event.acceptProposedAction()
@@ -1371,6 +2129,23 @@ class MainWindow(QMainWindow):
     THEME_FILE = os.path.join(application_path, "theme.json")
     TRIGGER_FILE = os.path.join(application_path, "triggers.json")
     AUDIO_LEVELS_FILE = os.path.join(application_path, "audio_levels.json")
+    VIDEO_DIMS_CACHE_FILE = os.path.join(application_path, "video_dims_cache.json")
+
+    # TikTok 狀態標籤的樣式表（依狀態類別預先定義）
+    _STATUS_QSS = {
+        "connected": "color: green; font-weight: bold;",
+        "error": "color: red;",
+        "connecting": "color: orange;",
+        "idle": "",
+    }
+    # 朗讀佇列檢視增量更新時，最多容許頭部一次被念掉幾筆；超過就整份重建
+    _TTS_VIEW_MAX_HEAD_SHIFT = 8
+    # 即時動態最多保留的筆數；超出 _EVENTS_LIST_TRIM_SLACK 筆後才一次刪回上限，不必每筆事件都刪一列
+    _EVENTS_LIST_MAX = 200
+    _EVENTS_LIST_TRIM_SLACK = 50
+    # 即時動態日誌緩衝：累積到任一門檻就不等計時器直接寫出
+    _EVENT_LOG_FLUSH_LINES = 100
+    _EVENT_LOG_FLUSH_CHARS = 32 * 1024
 
 
     DEV_LOG_CONTENT = """<h3>版本更新歷史</h3>
@@ -1410,17 +2185,47 @@ class MainWindow(QMainWindow):
         self.current_job_path: Optional[str] = None
         self.is_editing = False
         self._last_video_geometry: Optional[QRect] = None
-        self.gift_manager = GiftManager(self.GIFT_LIST_FILE)
+        self._saver = DebouncedSaver(delay=0.5)
+        # 禮物設定的快照/序列化也在 UI 執行緒上合併：連續變更只讀取、序列化一次，
+        # 實際寫檔仍交給 _saver 的背景執行緒
+        self._gift_map_save_timer = QTimer(self)
+        self._gift_map_save_timer.setSingleShot(True)
+        self._gift_map_save_timer.setInterval(500)
+        self._gift_map_save_timer.timeout.connect(self._do_save_gift_map)
+        # 媒體清單同樣合併儲存：大量拖放/移除只在最後序列化一次
+        self._library_save_timer = QTimer(self)
+        self._library_save_timer.setSingleShot(True)
+        self._library_save_timer.setInterval(200)
+        self._library_save_timer.timeout.connect(self._do_auto_save_library)
+        self.gift_manager = GiftManager(self.GIFT_LIST_FILE, saver=self._saver)
         self.trigger_manager = TriggerManager(self.TRIGGER_FILE)
+        self._trigger_dialog: Optional[TriggerEditDialog] = None
         self.tiktok_listener = TikTokListener(self)
-        self.event_log_buffer = []
+        # UI 端的合併緩衝：計時器到期或達門檻時整批交給 _event_log_writer
+        self.event_log_buffer: deque[str] = deque(maxlen=10000)
+        self._event_log_buffer_chars = 0  # 緩衝區內容的大約長度（字元數）
+        self._viewer_cache: set = set()  # viewer_list 目前顯示的暱稱
+        self._viewer_sorted: List[str] = []  # 同上，依 viewer_list 的順序（已排序）
+        # _on_tiktok_status 上次套用的樣式類別（None 表示尚未套用）
+        self._status_qss_key: Optional[str] = None
+        # 即時動態日誌的實際寫檔交給背景執行緒，UI 執行緒只負責合併後交付
+        self._event_log_writer = AppendLogWriter(self.EVENTS_LOG_FILE)
         self.video_dimensions_cache = {}
+        # 跨次啟動保存的影片尺寸：path -> [w, h, mtime, size]；檔案變動過就重新探測
+        self._video_dims_store: Dict[str, list] = {}
         self.theme_settings = {}
         self.gift_trigger_counts = {}
         self.path_to_gift_id_map = {}
+        # path -> 依序指向的 (gift 英文名, gift_id)（同路徑可有多筆映射）
+        self._path_gid_entries: Dict[str, List[Tuple[Optional[str], Optional[str]]]] = {}
+        self._gift_en_to_id: Dict[str, str] = {}
         self.playback_volume = 100
         self.speech_engine = SpeechEngine(self)
+        # 近期事件去重：deque 記住先後順序以便淘汰，set 負責 O(1) 查詢（兩者內容一致）
+        # 鍵不含訊息 ID 或時間（留言為內容、讚為次數、進場/關注只有事件類別與使用者），
+        # 窗口越大越容易把同一使用者正常的重複事件當成重複而吞掉，所以維持 20 筆
         self.recent_events = deque(maxlen=20)
+        self._recent_event_set: set = set()
 
         self.per_item_volume: Dict[str, int] = {}
         # 翻譯設定
@@ -1437,10 +2242,23 @@ class MainWindow(QMainWindow):
         #self._menu_saved_geometry: Optional[QRect] = None
 
         self._overlay_pending_size: Optional[tuple[int, int]] = None
+        # 待播清單上次顯示的內容；內容沒變就不重建 q_list
+        self._last_display_items: List[str] = []
+        # 留言朗讀/顯示選項的快取，由 _sync_comment_options 在勾選或文字變動時更新，
+        # 每則留言就不必再逐一讀取 widget、重新切割過濾關鍵字
+        self._read_comment_enabled = False
+        self._show_original_comment = True
+        self._tts_filter_keywords: Tuple[str, ...] = ()  # 未啟用過濾時為空
+        self._tts_truncate_enabled = False
         # 初始化所有計時器
+        # 即時動態日誌：有新事件才啟動，1 秒內的事件合併成一次寫檔（不再每 5 秒空轉輪詢）
         self.log_write_timer = QTimer(self)
+        self.log_write_timer.setSingleShot(True)
         self.viewer_list_updater = QTimer(self)
+        # 朗讀佇列檢視改由 SpeechEngine.queue_changed 驅動；計時器只用來合併短時間內的多次變動
         self.tts_queue_refresh_timer = QTimer(self)
+        self.tts_queue_refresh_timer.setSingleShot(True)
+        self.tts_queue_refresh_timer.setInterval(100)
         #self.queue_count_update_timer = QTimer(self)
 
         self._overlay_prev_opacity: float = 1.0
@@ -1456,8 +2274,6 @@ class MainWindow(QMainWindow):
         QTimer.singleShot(0, self._perform_initial_load)
         # --- 5. 啟動所有計時器 ---
         self.viewer_list_updater.start(5000)
-        self.log_write_timer.start(5000)
-        self.tts_queue_refresh_timer.start(1000)
         #self.queue_count_update_timer.start(1000)
 
         #self._check_for_first_run()
@@ -1494,9 +2310,10 @@ class MainWindow(QMainWindow):
         self._prune_invalid_gift_mappings()
         self._refresh_queue_view()
         self._load_audio_levels()
+        self._load_video_dims_cache()
         # self._load_translation_settings() # <--- 刪除這一行
         if self.per_item_volume:
-            valid = {self.lib_list.item(i).text() for i in range(self.lib_list.count())}
+            valid = set(self._library_paths())
             pruned = {k: v for k, v in self.per_item_volume.items() if k in valid}
             if pruned != self.per_item_volume:
                 self.per_item_volume = pruned
@@ -1508,8 +2325,8 @@ class MainWindow(QMainWindow):
     def _load_audio_levels(self):
         try:
             if os.path.exists(self.AUDIO_LEVELS_FILE):
-                with open(self.AUDIO_LEVELS_FILE, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                with open(self.AUDIO_LEVELS_FILE, "rb") as f:
+                    data = _json_loads(f.read())
                 self.per_item_volume = {
                     k: int(v) for k, v in (data or {}).items()
                     if isinstance(v, (int, float)) and 0 <= int(v) <= 200
@@ -1731,10 +2548,29 @@ class MainWindow(QMainWindow):
                 return True
         return False
 
+    def _load_video_dims_cache(self):
+        try:
+            if not os.path.exists(self.VIDEO_DIMS_CACHE_FILE):
+                return
+            with open(self.VIDEO_DIMS_CACHE_FILE, "rb") as f:
+                data = _json_loads(f.read())
+            if not isinstance(data, dict):
+                raise ValueError("格式不正確（應為物件）")
+        except Exception as e:
+            self._log(f"警告: 載入影片尺寸快取失敗: {e}")
+            return
+        # 只保留媒體庫內仍存在、格式正確（[w, h, mtime, size] 皆為數字）的項目；
+        # 下次寫檔時就會一併清掉其餘的
+        valid = set(self._library_paths())
+        self._video_dims_store = {
+            k: v for k, v in data.items()
+            if k in valid and isinstance(v, list) and len(v) == 4
+            and all(isinstance(x, (int, float)) and not isinstance(x, bool) for x in v)
+        }
+
     def _save_audio_levels(self):
         try:
-            with open(self.AUDIO_LEVELS_FILE, "w", encoding="utf-8") as f:
-                json.dump(self.per_item_volume, f, indent=2, ensure_ascii=False)
+            atomic_write_json(self.AUDIO_LEVELS_FILE, self.per_item_volume)
         except Exception as e:
             self._log(f"錯誤: 無法儲存個別音量檔: {e}")
 
@@ -1745,11 +2581,16 @@ class MainWindow(QMainWindow):
         eff = int(round(self.playback_volume * rel / 100.0))
         return max(0, min(150, eff))  # 與 volume_max/GUI 一致
 
+    def _current_library_path(self) -> Optional[str]:
+        """媒體庫目前選取項目的路徑；沒有選取時回傳 None。"""
+        item = self.lib_list.currentItem()
+        return item.text() if item else None
+
     def _set_item_volume(self):
-        if not self.lib_list.currentItem():
+        path = self._current_library_path()
+        if not path:
             QMessageBox.information(self, "提示", "請先在媒體庫選擇一個檔案。")
             return
-        path = self.lib_list.currentItem().text()
         current = int(self.per_item_volume.get(path, 100))
         val, ok = QInputDialog.getInt(
             self, "個別音量",
@@ -1906,7 +2747,8 @@ class MainWindow(QMainWindow):
             parts = [re.escape(k) for k in sorted(set(keywords), key=len, reverse=True)]
             pattern = "|".join(parts)
             try:
-                self._trigger_regex = re.compile(pattern, re.IGNORECASE)
+                # 關鍵字與留言都已轉小寫，不需要 IGNORECASE（逐字元折疊反而較慢）
+                self._trigger_regex = re.compile(pattern)
             except re.error:
                 # 正則建置失敗則放棄（極少見），最終會回到逐一掃描（不建議）
                 self._trigger_regex = None
@@ -1923,14 +2765,19 @@ class MainWindow(QMainWindow):
         self.queue.queue_changed.connect(self._refresh_queue_view)
 
         # TikTok 信號
-        self.tiktok_listener.on_video_triggered.connect(self._enqueue_video_from_gift)
-        self.tiktok_listener.on_event_received.connect(self._on_tiktok_event)
-        self.tiktok_listener.on_status_change.connect(self._on_tiktok_status)
+        # 監聽器的 signal 來自背景執行緒，明確指定排隊連線（見 TikTokListener 說明）
+        queued = Qt.ConnectionType.QueuedConnection
+        self.tiktok_listener.on_video_triggered.connect(self._enqueue_video_from_gift, queued)
+        self.tiktok_listener.on_event_received.connect(self._on_tiktok_event, queued)
+        self.tiktok_listener.on_events_batch.connect(self._on_tiktok_events, queued)
+        self.tiktok_listener.on_status_change.connect(self._on_tiktok_status, queued)
+        self.tab_gifts.gift_map_item_changed.connect(self._on_gift_map_item_changed)
 
         # 計時器信號
         self.log_write_timer.timeout.connect(self._flush_log_buffer_to_file)
         self.viewer_list_updater.timeout.connect(self._update_viewer_list)
         self.tts_queue_refresh_timer.timeout.connect(self._refresh_tts_queue_view)
+        self.speech_engine.queue_changed.connect(self._schedule_tts_queue_refresh)
         #self.queue_count_update_timer.timeout.connect(self._update_queue_counts_in_menu)
 
     def _setup_ui(self):
@@ -1985,10 +2832,11 @@ class MainWindow(QMainWindow):
             owner=self,  # 這行是關鍵：把 MainWindow 傳給 GiftsTab
             tiktok_listener=self.tiktok_listener,
             gift_manager=self.gift_manager,
-            get_library_paths=lambda: [self.lib_list.item(i).text() for i in range(self.lib_list.count())],
+            get_library_paths=self._library_paths,
             log_func=self._log,
             parent=self.tabs  # 可設為 self.tabs 或不設，均可
         )
+        self._sync_comment_options()
         self.tab_triggers = QWidget()
         self.tab_log = QWidget()
         self.tab_theme = QWidget()
@@ -2117,16 +2965,36 @@ class MainWindow(QMainWindow):
         self.tts_q_list = QListWidget()
         layout.addWidget(self.tts_q_list)
 
+    def _schedule_tts_queue_refresh(self):
+        # 不重新起算：連續變動時最多每 100ms 刷新一次，而不是一直往後延
+        if not self.tts_queue_refresh_timer.isActive():
+            self.tts_queue_refresh_timer.start()
+
     def _refresh_tts_queue_view(self):
         if not self.speech_engine:
             return
         snapshot = self.speech_engine.snapshot()
-        current_items = [self.tts_q_list.item(i).text() for i in range(self.tts_q_list.count())]
-        if current_items != snapshot:
-            self.tts_q_list.setUpdatesEnabled(False)
-            self.tts_q_list.clear()
-            self.tts_q_list.addItems(snapshot)
-            self.tts_q_list.setUpdatesEnabled(True)
+        lst = self.tts_q_list
+        current_items = [lst.item(i).text() for i in range(lst.count())]
+        if current_items == snapshot:
+            return
+        # 佇列通常只是「頭部被念掉幾筆、尾端新增幾筆」：找出頭部移除數，只動有變的部分
+        head = next((k for k in range(min(len(current_items), self._TTS_VIEW_MAX_HEAD_SHIFT) + 1)
+                     if current_items[k:k + len(snapshot)] == snapshot[:len(current_items) - k]), None)
+        lst.setUpdatesEnabled(False)
+        try:
+            if head is None:
+                lst.clear()
+                lst.addItems(snapshot)
+                return
+            for _ in range(head):
+                lst.takeItem(0)
+            kept = len(current_items) - head
+            for _ in range(kept - min(kept, len(snapshot))):
+                lst.takeItem(len(snapshot))
+            lst.addItems(snapshot[kept:])
+        finally:
+            lst.setUpdatesEnabled(True)
 
     def _setup_library_tab(self, parent):
         layout = QVBoxLayout(parent)
@@ -2135,6 +3003,15 @@ class MainWindow(QMainWindow):
 
         # 使用自訂的 LibraryListWidget（取代原本的 QListWidget）
         self.lib_list = LibraryListWidget()
+        # 路徑清單快取：新增/刪除列時就地跟著更新（只讀新增的那幾列），
+        # 其餘變動（改名、移動、排序、清空）才作廢，下次讀取時整份重建
+        self._library_paths_cache: Optional[List[str]] = None
+        lib_model = self.lib_list.model()
+        lib_model.rowsInserted.connect(self._on_library_rows_inserted)
+        lib_model.rowsRemoved.connect(self._on_library_rows_removed)
+        for sig in (lib_model.rowsMoved, lib_model.dataChanged,
+                    lib_model.layoutChanged, lib_model.modelReset):
+            sig.connect(self._invalidate_library_paths_cache)
         self.lib_list.itemDoubleClicked.connect(self._enqueue_selected_from_library)
         # 接收拖放完成的檔案清單
         self.lib_list.filesDropped.connect(self._on_library_files_dropped)
@@ -2213,37 +3090,60 @@ class MainWindow(QMainWindow):
         self._refresh_trigger_tree()
 
     def _refresh_trigger_tree(self):
-        self.trigger_tree.clear()
+        # 與禮物映射樹相同：先在樹外建好項目，再一次插入
+        items = []
         for item in self.trigger_manager.get_all_triggers():
             keyword = item.get("keyword", "N/A")
             path = item.get("path", "")
             tts_response = item.get("tts_response", "")
 
-            display_path = os.path.basename(path) if path else "---"
+            display_path = _basename(path) if path else "---"
             display_tts = tts_response if tts_response else "---"
 
             tree_item = QTreeWidgetItem([keyword, display_path, display_tts])
 
-            if path and not os.path.exists(path):
-                tree_item.setForeground(1, QColor("red"))
+            if path and not _path_exists_cached(path):
+                tree_item.setForeground(1, _MISSING_FILE_BRUSH)
                 tree_item.setToolTip(1, f"檔案不存在！\n路徑: {path}")
 
-            self.trigger_tree.addTopLevelItem(tree_item)
-        self.trigger_tree.resizeColumnToContents(0)
+            items.append(tree_item)
+
+        tree = self.trigger_tree
+        sorting = tree.isSortingEnabled()
+        tree.setUpdatesEnabled(False)
+        tree.setSortingEnabled(False)
+        blocker = QSignalBlocker(tree)
+        try:
+            tree.clear()
+            tree.addTopLevelItems(items)
+        finally:
+            blocker.unblock()
+            tree.setSortingEnabled(sorting)
+            tree.setUpdatesEnabled(True)
+        tree.resizeColumnToContents(0)
 
     # 在新增/更新/刪除觸發器後，呼叫重建（_add_trigger/_edit_trigger/_del_trigger 內）
+    def _trigger_edit_dialog(self, item: Optional[dict], library_paths: List[str]) -> TriggerEditDialog:
+        # 與禮物映射對話框相同：建立一次，之後只換內容
+        if self._trigger_dialog is None:
+            self._trigger_dialog = TriggerEditDialog(self, item=item, library_paths=library_paths)
+        else:
+            self._trigger_dialog.populate(item, library_paths)
+        return self._trigger_dialog
+
     def _add_trigger(self):
-        library_paths = [self.lib_list.item(i).text() for i in range(self.lib_list.count())]
+        library_paths = self._library_paths()
         if not library_paths:
             QMessageBox.warning(self, "提示", "媒體庫是空的，請先加入一些影片。")
             return
-        dialog = TriggerEditDialog(self, library_paths=library_paths)
+        dialog = self._trigger_edit_dialog(None, library_paths)
         if dialog.exec():
             new_data = dialog.get_data()
             if not new_data.get("keyword") or (not new_data.get("path") and not new_data.get("tts_response")):
                 QMessageBox.warning(self, "提示", "關鍵字不能為空，且必須至少設定一個觸發動作（影片或朗讀）。")
                 return
             self.trigger_manager.add_trigger(new_data)
+            _invalidate_path_exists_cache(new_data.get("path"))
             self._refresh_trigger_tree()
             self._rebuild_trigger_matcher()  # 新增：重建比對器
 
@@ -2255,8 +3155,8 @@ class MainWindow(QMainWindow):
         index = self.trigger_tree.indexOfTopLevelItem(selected)
         item_data = self.trigger_manager.get_all_triggers()[index]
 
-        library_paths = [self.lib_list.item(i).text() for i in range(self.lib_list.count())]
-        dialog = TriggerEditDialog(self, item=item_data, library_paths=library_paths)
+        library_paths = self._library_paths()
+        dialog = self._trigger_edit_dialog(item_data, library_paths)
         if dialog.exec():
             updated_data = dialog.get_data()
             if not updated_data.get("keyword") or (
@@ -2264,6 +3164,7 @@ class MainWindow(QMainWindow):
                 QMessageBox.warning(self, "提示", "關鍵字不能為空，且必須至少設定一個觸發動作（影片或朗讀）。")
                 return
             self.trigger_manager.update_trigger(index, updated_data)
+            _invalidate_path_exists_cache(updated_data.get("path"))
             self._refresh_trigger_tree()
             self._rebuild_trigger_matcher()  # 新增：重建比對器
 
@@ -2290,6 +3191,8 @@ class MainWindow(QMainWindow):
     def _setup_events_tab(self, parent):
         layout = QVBoxLayout(parent)
         self.events_list = QListWidget()
+        # 每列都是單行文字，列高只需計算一次
+        self.events_list.setUniformItemSizes(True)
         layout.addWidget(self.events_list)
         # 新增：翻譯區塊（置於底部）
 
@@ -2416,14 +3319,10 @@ class MainWindow(QMainWindow):
         self._update_theme_tab_ui()
 
     def _update_theme_tab_ui(self):
-        bg_color_str = self.theme_settings.get("background_color", "rgba(0,0,0,180)")
-        self.bg_color_btn.setText(bg_color_str)
-        self.bg_color_btn.setStyleSheet(
-            f"background-color: {bg_color_str}; color: white; text-shadow: 1px 1px 2px black;")
-        text_color_str = self.theme_settings.get("text_color", "white")
-        self.text_color_btn.setText(text_color_str)
-        self.text_color_btn.setStyleSheet(
-            f"background-color: {text_color_str}; color: black; text-shadow: 1px 1px 2px white;")
+        self._set_color_button(self.bg_color_btn,
+                               self.theme_settings.get("background_color", "rgba(0,0,0,180)"), True)
+        self._set_color_button(self.text_color_btn, self.theme_settings.get("text_color", "white"), False)
+        # QSpinBox.setValue 在值相同時本身就不會重繪或發出訊號
         self.font_size_spinbox.setValue(self.theme_settings.get("font_size", 16))
         self.radius_spinbox.setValue(self.theme_settings.get("border_radius", 10))
         self.spacing_spinbox.setValue(self.theme_settings.get("item_spacing", 10))
@@ -2442,62 +3341,134 @@ class MainWindow(QMainWindow):
             color = dialog.selectedColor()
             if use_rgba:
                 color_str = f"rgba({color.red()}, {color.green()}, {color.blue()}, {color.alpha()})"
-                button.setText(color_str)
-                button.setStyleSheet(f"background-color: {color_str}; color: white; text-shadow: 1px 1px 2px black;")
             else:
                 color_str = color.name()
-                button.setText(color_str)
-                button.setStyleSheet(f"background-color: {color_str}; color: black; text-shadow: 1px 1px 2px white;")
+            self._set_color_button(button, color_str, use_rgba)
+
+    @staticmethod
+    def _set_color_button(button: QPushButton, color_str: str, light_text: bool):
+        # 按鈕文字與樣式總是一起設定，文字相同代表樣式也相同，不必重新解析樣式表
+        if button.text() == color_str:
+            return
+        button.setText(color_str)
+        button.setStyleSheet(_color_swatch_style(color_str, light_text))
 
     # ==================== 其他 MainWindow 方法 ====================
     def _build_path_to_gift_id_map(self):
+        """完整重建（僅初始載入/清理映射/禮物清單變動時使用）；單筆編輯走 _index_add/_index_remove/_index_replace。"""
+        self._index_clear()
+        self._gift_en_to_id = dict(self.gift_manager.get_id_index())
+        for item in self.tiktok_listener.gift_map:
+            self._index_add(item)
+
+    def _index_clear(self):
         self.path_to_gift_id_map.clear()
-        gift_en_to_id = {g.get("name_en"): g.get("id") for g in self.gift_manager.get_all_gifts()}
+        self._path_gid_entries.clear()
+
+    def _index_entry_for(self, item: dict) -> Tuple[Optional[str], Tuple[Optional[str], Optional[str]]]:
+        # 每筆有路徑的映射都收錄（沒有 kw/查不到 ID 時對應欄位為 None），順序與 gift_map 一致
+        kw = item.get("kw") or None
+        return item.get("path"), (kw, self._gift_en_to_id.get(kw) if kw else None)
+
+    def _sync_path_gift_id(self, path: str):
+        # 與完整重建一致：同一路徑以 gift_map 中最後一筆有 ID 的映射為準
+        for _, gift_id in reversed(self._path_gid_entries.get(path, ())):
+            if gift_id:
+                self.path_to_gift_id_map[path] = gift_id
+                return
+        self.path_to_gift_id_map.pop(path, None)
 
-        for item in self.tiktok_listener.gift_map:
-            path = item.get("path")
-            kw = item.get("kw")
-            if path and kw:
-                gift_id = gift_en_to_id.get(kw)
-                if gift_id:
-                    self.path_to_gift_id_map[path] = gift_id
+    def _reindex_path(self, path: str):
+        entries = [self._index_entry_for(item)[1] for item in self.tiktok_listener.gift_map if item.get("path") == path]
+        if entries:
+            self._path_gid_entries[path] = entries
+        else:
+            self._path_gid_entries.pop(path, None)
+        self._sync_path_gift_id(path)
+
+    def _index_add(self, item: dict):
+        path, entry = self._index_entry_for(item)
+        if not path:
+            return
+        self._path_gid_entries.setdefault(path, []).append(entry)
+        if entry[1]:
+            self.path_to_gift_id_map[path] = entry[1]
+
+    def _index_remove(self, item: dict):
+        path, entry = self._index_entry_for(item)
+        entries = self._path_gid_entries.get(path) if path else None
+        if not entries or entry not in entries:
+            return
+        # 移除最後一筆相同的映射，保留其餘映射的先後次序
+        del entries[len(entries) - 1 - entries[::-1].index(entry)]
+        if not entries:
+            del self._path_gid_entries[path]
+        self._sync_path_gift_id(path)
+
+    def _index_replace(self, old_item: dict, new_item: dict):
+        old_path, old_entry = self._index_entry_for(old_item)
+        new_path, new_entry = self._index_entry_for(new_item)
+        entries = self._path_gid_entries.get(old_path) if old_path else None
+        if old_path == new_path and entries and old_entry in entries:
+            # 路徑不變：原地替換，維持 gift_map 中的先後次序
+            entries[entries.index(old_entry)] = new_entry
+            self._sync_path_gift_id(new_path)
+            return
+        # 換了路徑：舊路徑移除一筆，新路徑依 gift_map 順序重排（編輯很少發生，掃一次無妨）
+        self._index_remove(old_item)
+        if new_path:
+            self._reindex_path(new_path)
+
+    def _on_gift_map_item_changed(self, old_item: Optional[dict], new_item: Optional[dict]):
+        if old_item and new_item:
+            self._index_replace(old_item, new_item)
+        elif old_item:
+            self._index_remove(old_item)
+        elif new_item:
+            self._index_add(new_item)
+
+    def _menu_is_showing(self) -> bool:
+        # 折疊狀態的菜單雖然 isVisible()，但 1x1 且全透明，看不到就不必更新
+        return bool(self.game_menu_container and self.menu_overlay_window.isVisible()
+                    and not getattr(self, "_menu_collapsed", False))
 
     def _update_queue_counts_in_menu(self):
-        if not self.game_menu_container or not self.menu_overlay_window.isVisible():
+        # 看不到菜單時連佇列快照都不取；顯示/還原時 _refresh_menu_content 會重新套用
+        if not self._menu_is_showing():
             return
+        self._apply_queue_counts_to_menu()
 
-        # 1) 將佇列中的 path 直接彙總為 gift_id 計數
-        queue_snapshot = self.queue.snapshot()
+    def _apply_queue_counts_to_menu(self):
+
+        # 1) 先在 C 層數出每個 path 的份數（佇列中重複次數是逐份展開的），再依 path 彙總為 gift_id 計數
+        path_counts = Counter(map(itemgetter(0), self.queue.snapshot()))
+        path_to_gid = self.path_to_gift_id_map
         counts_by_gift: Dict[str, int] = {}
-        for path, _ in queue_snapshot:
-            gid = self.path_to_gift_id_map.get(path)
+        for path, n in path_counts.items():
+            gid = path_to_gid.get(path)
             if gid:
-                counts_by_gift[gid] = counts_by_gift.get(gid, 0) + 1
+                counts_by_gift[gid] = counts_by_gift.get(gid, 0) + n
 
-        # 2) 如需避免不必要的 UI 重繪，可比對上次結果
-        if getattr(self, "_last_counts_by_gift", None) == counts_by_gift:
+        # 2) 如需避免不必要的 UI 重繪，可比對上次結果（顯示開關也算在內）
+        show = self.show_queue_counter_checkbox.isChecked()
+        state = (counts_by_gift, show)
+        if getattr(self, "_last_counts_by_gift", None) == state:
             return
-        self._last_counts_by_gift = counts_by_gift
+        self._last_counts_by_gift = state
 
-        # 3) 更新 UI（僅當菜單視窗可見）
+        # 3) 更新 UI（僅當菜單視窗可見）；整批更新期間暫停重繪，最後只重畫一次
         list_widget = self.game_menu_container.list_widget
-        show = self.show_queue_counter_checkbox.isChecked()
-        for i in range(list_widget.count()):
-            widget = list_widget.itemWidget(list_widget.item(i))
-            if isinstance(widget, MenuItemWidget):
-                gift_id = widget.gift_info.get("id")
-                new_count = counts_by_gift.get(gift_id, 0)
-                widget.set_queue_count(new_count, show)
+        list_widget.setUpdatesEnabled(False)
+        try:
+            for widget in self.game_menu_container.menu_widgets():
+                widget.set_queue_count(counts_by_gift.get(widget.gift_info.get("id"), 0), show)
+        finally:
+            list_widget.setUpdatesEnabled(True)
 
     def _on_show_counter_toggled(self, checked: bool):
-        if not self.game_menu_container or not self.menu_overlay_window.isVisible():
+        if not self._menu_is_showing():
             return
-        list_widget = self.game_menu_container.list_widget
-        for i in range(list_widget.count()):
-            list_item = list_widget.item(i)
-            widget = list_widget.itemWidget(list_item)
-            if isinstance(widget, MenuItemWidget):
-                widget.show_counter(checked)
+        self.game_menu_container.set_show_counter(checked)
 
     def _reset_gift_counts(self):
         reply = QMessageBox.question(self, "確認", "確定要將所有禮物計數歸零嗎？")
@@ -2563,10 +3534,12 @@ class MainWindow(QMainWindow):
         elif action == remove_action:
             self._remove_selected_from_library()
 
-    def _refresh_menu_content(self):
-        """刷新並設定遊戲菜單的內容，並更新計數"""
+    def _refresh_menu_content(self, force: bool = False):
+        """刷新並設定遊戲菜單的內容，並更新計數；菜單看不到時略過（顯示/還原時會以 force=True 重建）"""
         if not self.game_menu_container:
             return
+        if not force and not self._menu_is_showing():
+            return
 
         self.game_menu_container.theme_settings = self.theme_settings
         self.game_menu_container.apply_theme()
@@ -2581,10 +3554,14 @@ class MainWindow(QMainWindow):
             self.gift_trigger_counts,
             self.show_counter_checkbox.isChecked()
         )
+        # 菜單項目是新建的，待播數字要重新套用，不能沿用上次的比對結果
+        self._last_counts_by_gift = None
+        self._apply_queue_counts_to_menu()
 
     def _toggle_menu_overlay_window(self):
         # 折疊/還原菜單 Overlay；還原時會先 refresh 內容
-        self._toggle_collapsible_window(self.menu_overlay_window, "menu", refresh_cb=self._refresh_menu_content)
+        self._toggle_collapsible_window(self.menu_overlay_window, "menu",
+                                        refresh_cb=lambda: self._refresh_menu_content(force=True))
 
     def _load_layouts(self) -> LayoutsData:
         # 與舊介面相容：回傳 dict，但實際由 LayoutsManager 管
@@ -2608,31 +3585,42 @@ class MainWindow(QMainWindow):
         self.overlay_window.setFixedSize(w, h)
         self._update_child_geometries()
 
+    def _aspect_ratio_key(self) -> str:
+        """目前畫面比例在 layouts 中的鍵（"16:9" / "9:16"）。"""
+        return "16:9" if self.aspect_16_9.isChecked() else "9:16"
+
     def _get_video_dimensions(self, path: str) -> Optional[tuple[int, int]]:
         if path in self.video_dimensions_cache:
             return self.video_dimensions_cache[path]
-        if not cv2:
-            self._log("警告: cv2 模組不可用，無法獲取影片尺寸。使用預設值。")
+        try:
+            st = os.stat(path)
+            stamp = [st.st_mtime, st.st_size]
+        except OSError:
+            stamp = None
+        entry = self._video_dims_store.get(path)
+        if stamp and entry and entry[2:] == stamp:
+            dims = (int(entry[0]), int(entry[1]))
+            self.video_dimensions_cache[path] = dims
+            return dims
+        if not _can_probe_video_dims():
+            self._log("警告: PyAV / ffprobe / cv2 皆不可用，無法獲取影片尺寸。使用預設值。")
             return (1920, 1080) if self.aspect_16_9.isChecked() else (1080, 1920)
 
-        cap = None  # 先宣告，避免靜態分析警告
-        try:
-            cap = cv2.VideoCapture(path)
-            if not cap.isOpened():
-                self._log(f"錯誤: 無法開啟影片 - {path}")
-                return None
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            self.video_dimensions_cache[path] = (width, height)
-            return width, height
-        finally:
-            if cap is not None and cap.isOpened():
-                cap.release()
+        dims = _probe_dims_fast(path)
+        if dims is None:
+            self._log(f"錯誤: 無法開啟影片 - {path}")
+            return None
+        self.video_dimensions_cache[path] = dims
+        if stamp:
+            self._video_dims_store[path] = [dims[0], dims[1], *stamp]
+            # 寫檔由 _saver 延遲合併、在背景執行緒進行
+            self._saver.schedule(self.VIDEO_DIMS_CACHE_FILE, _json_dumps(self._video_dims_store))
+        return dims
 
     def _enter_edit_mode(self):
-        if self.is_editing or not self.lib_list.currentItem():
+        path = None if self.is_editing else self._current_library_path()
+        if not path:
             return
-        path = self.lib_list.currentItem().text()
         dims = self._get_video_dimensions(path)
         if not dims:
             QMessageBox.critical(self, "錯誤", "無法讀取影片尺寸")
@@ -2646,7 +3634,7 @@ class MainWindow(QMainWindow):
         self.player.stop_playback()
         self._set_player_state(PlayerState.IDLE)
 
-        aspect_ratio_str = "16:9" if self.aspect_16_9.isChecked() else "9:16"
+        aspect_ratio_str = self._aspect_ratio_key()
         layout_ratio = self.layouts.get(path, {}).get(aspect_ratio_str)
         initial_rect = QRect()
         overlay_rect = self.overlay_window.contentsRect()
@@ -2682,9 +3670,9 @@ class MainWindow(QMainWindow):
     def _exit_edit_mode(self, save: bool):
         if not self.is_editing:
             return
-        path = self.lib_list.currentItem().text()
+        path = self._current_library_path()
         self.player.stop_playback()
-        if save:
+        if save and path:
             rect = self.video_container.geometry()
             overlay_rect = self.overlay_window.contentsRect()
             if overlay_rect.width() > 0 and overlay_rect.height() > 0:
@@ -2694,7 +3682,7 @@ class MainWindow(QMainWindow):
                     "w": rect.width() / overlay_rect.width(),
                     "h": rect.height() / overlay_rect.height()
                 }
-                aspect_ratio_str = "16:9" if self.aspect_16_9.isChecked() else "9:16"
+                aspect_ratio_str = self._aspect_ratio_key()
                 self.layouts.setdefault(path, {})[aspect_ratio_str] = layout
                 self._save_layouts()
 
@@ -2743,10 +3731,39 @@ class MainWindow(QMainWindow):
         self.monitor_list.addItem(s)
         self.monitor_list.scrollToBottom()
 
+    def _invalidate_library_paths_cache(self, *_):
+        self._library_paths_cache = None
+
+    # 呼叫端可能還拿著舊的快取清單，所以一律換成新 list，不就地修改
+    def _on_library_rows_inserted(self, _parent, first: int, last: int):
+        cache = self._library_paths_cache
+        if cache is None:
+            return
+        lib = self.lib_list
+        added = [lib.item(i).text() for i in range(first, last + 1)]
+        self._library_paths_cache = cache[:first] + added + cache[first:]
+
+    def _on_library_rows_removed(self, _parent, first: int, last: int):
+        cache = self._library_paths_cache
+        if cache is not None:
+            self._library_paths_cache = cache[:first] + cache[last + 1:]
+
+    def _library_paths(self) -> List[str]:
+        """媒體清單目前的所有路徑（依顯示順序）；回傳的是快取，請勿修改。"""
+        if self._library_paths_cache is None:
+            lib = self.lib_list
+            self._library_paths_cache = [lib.item(i).text() for i in range(lib.count())]
+        return self._library_paths_cache
+
+    def _log_many(self, lines: List[str]):
+        # 一次加入多行並只捲動一次
+        self.monitor_list.addItems(lines)
+        self.monitor_list.scrollToBottom()
+
     def _add_library_items(self, paths: List[str]):
         if not paths:
             return
-        existing = {self.lib_list.item(i).text() for i in range(self.lib_list.count())}
+        existing = set(self._library_paths())
         new_items = [p for p in paths if p not in existing]
         if new_items:
             self.lib_list.addItems(new_items)
@@ -2754,21 +3771,21 @@ class MainWindow(QMainWindow):
 
     def _pick_files(self):
         paths, _ = QFileDialog.getOpenFileNames(
-            self, "選擇影片檔案", "", "影片檔案 (*.mp4 *.mkv *.mov *.avi)")
+            self, "選擇影片檔案", "", _VIDEO_FILE_FILTER)
         if paths:
             self._add_library_items(paths)
 
 
     def _enqueue_selected_from_library(self):
-        if self.lib_list.currentItem():
-            path = self.lib_list.currentItem().text()
+        path = self._current_library_path()
+        if path:
             self.queue.enqueue(path, note=os.path.basename(path))
             self._play_next_if_idle()
 
     def _reset_selected_layout(self):
-        if not self.lib_list.currentItem():
+        path = self._current_library_path()
+        if not path:
             return
-        path = self.lib_list.currentItem().text()
         if path in self.layouts and QMessageBox.question(
                 self, "確認",
                 f"確定要重設 '{os.path.basename(path)}' 的版面嗎？"
@@ -2779,8 +3796,8 @@ class MainWindow(QMainWindow):
 
     # 同步清掉個別音量：移除單一項目
     def _remove_selected_from_library(self):
-        if self.lib_list.currentItem():
-            path = self.lib_list.currentItem().text()
+        path = self._current_library_path()
+        if path:
             self.lib_list.takeItem(self.lib_list.currentRow())
             # 刪除 per-item volume
             if path in self.per_item_volume:
@@ -2810,8 +3827,12 @@ class MainWindow(QMainWindow):
             self._prune_invalid_gift_mappings()
 
     def _auto_save_library(self):
+        self._library_save_timer.start()
+
+    def _do_auto_save_library(self):
+        self._library_save_timer.stop()
         try:
-            items = [self.lib_list.item(i).text() for i in range(self.lib_list.count())]
+            items = self._library_paths()
             self.library_mgr.save_list(items)
         except IOError as e:
             self._log(f"錯誤: 無法自動儲存媒體清單到 {self.LIBRARY_FILE}: {e}")
@@ -2840,13 +3861,14 @@ class MainWindow(QMainWindow):
         path, _ = QFileDialog.getSaveFileName(
             self, "另存媒體清單", "", "JSON 檔案 (*.json);;文字檔案 (*.txt)")
         if path:
-            items = [self.lib_list.item(i).text() for i in range(self.lib_list.count())]
+            items = self._library_paths()
             try:
-                with open(path, 'w', encoding='utf-8') as f:
-                    if path.endswith('.json'):
-                        json.dump(items, f, indent=2)
-                    else:
-                        f.write('\n'.join(items))
+                if path.endswith('.json'):
+                    atomic_write_json(path, items)
+                else:
+                    # 逐行寫出，不先組成整份字串（載入時逐行讀取並略過空行，結尾換行無妨）
+                    with open(path, 'w', encoding='utf-8') as f:
+                        f.writelines(item + '\n' for item in items)
             except IOError as e:
                 self._log(f"錯誤: 無法儲存清單到 {path}: {e}")
 
@@ -2858,7 +3880,7 @@ class MainWindow(QMainWindow):
             try:
                 with open(path, 'r', encoding='utf-8') as f:
                     if path.endswith('.json'):
-                        items = json.load(f)
+                        items = _json_loads(f.read())
                     else:
                         items = [line.strip() for line in f if line.strip()]
                 if isinstance(items, list):
@@ -2882,33 +3904,40 @@ class MainWindow(QMainWindow):
                 self._log(f"錯誤: 無法從檔案載入清單 {path}: {e}")
 
     def _refresh_queue_view(self):
-        self.q_list.clear()
         snapshot = self.queue.snapshot()
-        if not snapshot:
-            self.setWindowTitle(f"Overlay UltraLite - {self.VERSION} [待播: 0]")
-            return
 
-        display_items = []
-        current_note = snapshot[0][1]
-        count = 1
-        for i in range(1, len(snapshot)):
-            note = snapshot[i][1]
-            if note == current_note:
-                count += 1
-            else:
-                if count > 1:
-                    display_items.append(f"{current_note} (x{count})")
+        # 連續相同的項目合併成一行 "名稱 (xN)"
+        display_items: List[str] = []
+        if snapshot:
+            current_note = snapshot[0][1]
+            count = 1
+            for i in range(1, len(snapshot)):
+                note = snapshot[i][1]
+                if note == current_note:
+                    count += 1
                 else:
-                    display_items.append(current_note)
-                current_note = note
-                count = 1
-        if count > 1:
-            display_items.append(f"{current_note} (x{count})")
-        else:
-            display_items.append(current_note)
+                    if count > 1:
+                        display_items.append(f"{current_note} (x{count})")
+                    else:
+                        display_items.append(current_note)
+                    current_note = note
+                    count = 1
+            if count > 1:
+                display_items.append(f"{current_note} (x{count})")
+            else:
+                display_items.append(current_note)
+
+        self.setWindowTitle(f"Overlay UltraLite - {self.VERSION} [待播: {len(snapshot)}]")
+        if display_items == self._last_display_items:
+            return
+        self._last_display_items = display_items
 
-        self.q_list.addItems(display_items)
-        self.setWindowTitle(f"Overlay UltraLite - {self.VERSION} [待播: {len(self.queue)}]")
+        self.q_list.setUpdatesEnabled(False)
+        try:
+            self.q_list.clear()
+            self.q_list.addItems(display_items)
+        finally:
+            self.q_list.setUpdatesEnabled(True)
 
     def _play_next_if_idle(self):
         if self.player_state != PlayerState.IDLE or self.is_editing:
@@ -2983,7 +4012,7 @@ class MainWindow(QMainWindow):
         if path:
             target_path = path
             rect = self.overlay_window.contentsRect()
-            aspect_ratio_str = "16:9" if self.aspect_16_9.isChecked() else "9:16"
+            aspect_ratio_str = self._aspect_ratio_key()
             layout_ratio = self.layouts.get(target_path, {}).get(aspect_ratio_str)
 
             final_rect = QRect()
@@ -2996,13 +4025,19 @@ class MainWindow(QMainWindow):
             else:
                 final_rect = rect
 
-            self.video_container.setGeometry(final_rect)
+            self._set_video_geometry(final_rect)
             return final_rect
         elif self._last_video_geometry:
-            self.video_container.setGeometry(self._last_video_geometry)
+            self._set_video_geometry(self._last_video_geometry)
             return self._last_video_geometry
         return QRect()
 
+    def _set_video_geometry(self, rect: QRect):
+        # 與目前位置相同就不再設定，避免縮放/排播時連帶觸發子元件重新排版；
+        # 比對的是元件實際的 geometry，播完時被移到角落的 1x1 狀態也能正確還原
+        if self.video_container.geometry() != rect:
+            self.video_container.setGeometry(rect)
+
     def _set_player_state(self,
                           new_state: PlayerState,
                           job_path: Optional[str] = None):
@@ -3028,38 +4063,28 @@ class MainWindow(QMainWindow):
             self.queue.enqueue(path, repeat=count, note=note)
             self._play_next_if_idle()
 
-        triggered_gift_key = None
-        triggered_gift_id = None
-        for item in self.tiktok_listener.gift_map:
-            if item.get("path") == path:
-                triggered_gift_key = item.get("kw")
-                for gift in self.gift_manager.get_all_gifts():
-                    if gift.get("name_en") == triggered_gift_key:
-                        triggered_gift_id = gift.get("id")
-                        break
-                break
+        # 直接查索引：同一路徑有多筆映射時，以 gift_map 中第一筆為準（沒有 ID 時只高亮、不計數）
+        entries = self._path_gid_entries.get(path)
+        if not entries:
+            return
+        triggered_gift_key, triggered_gift_id = entries[0]
 
         if triggered_gift_id:
-            current_count = self.gift_trigger_counts.get(triggered_gift_id, 0)
-            self.gift_trigger_counts[triggered_gift_id] = current_count + count
-            self._update_single_counter_in_menu(triggered_gift_id, self.gift_trigger_counts[triggered_gift_id])
+            new_count = self.gift_trigger_counts.get(triggered_gift_id, 0) + count
+            self.gift_trigger_counts[triggered_gift_id] = new_count
+            self._update_single_counter_in_menu(triggered_gift_id, new_count)
 
-        if triggered_gift_key and self.game_menu_container and self.menu_overlay_window.isVisible():
+        if triggered_gift_key and self._menu_is_showing():
             self.game_menu_container.highlight_item_by_key(triggered_gift_key)
 
     def _update_single_counter_in_menu(self, gift_id: str, new_count: int):
-        if not self.game_menu_container or not self.menu_overlay_window.isVisible():
+        if not self._menu_is_showing():
             return
+        widget = self.game_menu_container.widget_for_gift_id(gift_id)
+        if widget is not None:
+            widget.set_count(new_count)
 
-        list_widget = self.game_menu_container.list_widget
-        for i in range(list_widget.count()):
-            list_item = list_widget.item(i)
-            widget = list_widget.itemWidget(list_item)
-            if isinstance(widget, MenuItemWidget) and widget.gift_info.get("id") == gift_id:
-                widget.set_count(new_count)
-                break
-
-    def _add_event_item(self, text: str, color: Optional[QColor] = None):
+    def _add_event_item(self, text: str, color: Optional[QBrush] = None):
         """一個輔助函式，用來將項目新增到即時動態列表，並處理自動滾動。"""
         scroll_bar = self.events_list.verticalScrollBar()
         is_at_bottom = (scroll_bar.value() >= scroll_bar.maximum() - 5)
@@ -3069,76 +4094,120 @@ class MainWindow(QMainWindow):
             item.setForeground(color)
 
         self.events_list.addItem(item)
-        if self.events_list.count() > 200:
-            self.events_list.takeItem(0)
+        excess = self.events_list.count() - self._EVENTS_LIST_MAX
+        if excess > self._EVENTS_LIST_TRIM_SLACK:
+            self.events_list.model().removeRows(0, excess)
 
         if is_at_bottom:
             self.events_list.scrollToBottom()
 
-    def _on_tiktok_event(self, event: dict):
-        event_type = event.get("type")
-
-        user = event.get('user', '匿名')
-        message_content = event.get('message', '') or event.get('gift_name', '') or str(event.get('count', ''))
-        event_key = (event_type, user, message_content)
+    def _on_tiktok_events(self, events: list):
+        # 監聽器整批送來的事件，逐一交給 _on_tiktok_event 處理；LOG 先收集，最後一次寫入監控列表
+        log_lines: List[str] = []
+        self.events_list.setUpdatesEnabled(False)
+        try:
+            for event in events:
+                if isinstance(event, dict):
+                    self._on_tiktok_dict_event(event, log_lines)
+                else:
+                    self._on_tiktok_event(event)
+        finally:
+            self.events_list.setUpdatesEnabled(True)
+        if log_lines:
+            self._log_many(log_lines)
 
-        if event_key in self.recent_events:
+    def _on_tiktok_event(self, event: TikTokEvent):
+        if isinstance(event, dict):
+            self._on_tiktok_dict_event(event)
             return
 
-        self.recent_events.append(event_key)
-        timestamp = time.strftime("%H:%M:%S")
-
-        message = ""
-        color = None
+        user = event.user or '匿名'
+        if isinstance(event, CommentEv):
+            event_key = ("COMMENT", user, event.message)
+        elif isinstance(event, GiftEv):
+            event_key = ("GIFT", user, event.gift_name)
+        elif isinstance(event, LikeEv):
+            event_key = ("LIKE", user, str(event.count))
+        else:
+            event_key = (type(event).__name__, user, "")
 
-        if event_type == "LOG":
-            self._log(f"[TikTok] [{event.get('tag', 'INFO')}] {event.get('message', '')}")
+        if self._seen_recent_event(event_key):
             return
+        timestamp = time.strftime("%H:%M:%S")
 
-        elif event_type == "COMMENT":
-            msg = event.get('message', '')
+        if isinstance(event, CommentEv):
+            msg = event.message
             original_message_line = f"[{timestamp}] 💬 {user}: {msg}"
             self._check_comment_for_triggers(msg)
             self._log_realtime_event(original_message_line)
 
             # 判斷是否需要翻譯
-            read_enabled = getattr(self.tab_gifts, "read_comment_checkbox", None) and self.tab_gifts.read_comment_checkbox.isChecked()
+            read_enabled = self._read_comment_enabled
             needs_translate = self.auto_translate_enabled and (not self._contains_cjk(msg)) and self._ensure_translator()
 
             if needs_translate:
                 # --- 處理需要翻譯的留言 ---
-                show_original = hasattr(self, "tab_gifts") and self.tab_gifts.show_original_comment_checkbox.isChecked()
-                if show_original:
-                    self._add_event_item(original_message_line, QColor("gray")) # 顯示灰色原文
+                if self._show_original_comment:
+                    self._add_event_item(original_message_line, _EVENT_BRUSHES["gray"]) # 顯示灰色原文
                 self._translate_comment_async(user, msg, also_tts=read_enabled) # 進行翻譯(完成後會顯示橘色譯文)
             else:
                 # --- 處理不需要翻譯的留言 ---
                 self._add_event_item(original_message_line) # 直接顯示黑色原文
                 self._process_and_say_comment(user, msg) # 朗讀原文
-
             return # 留言事件處理完畢
 
-        elif event_type == "GIFT":
-            gift_name = event.get('gift_name', '禮物')
-            count = event.get('count', 1)
-            message = f"[{timestamp}] 🎁 {user} 送出 {gift_name} x{count}"
-            color = QColor("darkGreen")
-        elif event_type == "LIKE":
-            count = event.get('count', 1)
-            message = f"[{timestamp}] ❤️ {user} 按了 {count} 個讚"
-            color = QColor("red")
-        elif event_type == "JOIN":
+        if isinstance(event, GiftEv):
+            message = f"[{timestamp}] 🎁 {user} 送出 {event.gift_name or '禮物'} x{event.count}"
+            color = _EVENT_BRUSHES["darkGreen"]
+        elif isinstance(event, LikeEv):
+            message = f"[{timestamp}] ❤️ {user} 按了 {event.count} 個讚"
+            color = _EVENT_BRUSHES["red"]
+        elif isinstance(event, JoinEv):
             message = f"[{timestamp}] 👋 {user} 進入了直播間"
-            color = QColor("gray")
-        elif event_type == "FOLLOW":
+            color = _EVENT_BRUSHES["gray"]
+        elif isinstance(event, FollowEv):
             message = f"[{timestamp}] 💖 {user} 關注了主播！"
-            color = QColor("blue")
+            color = _EVENT_BRUSHES["blue"]
         else:
-            message = f"[{timestamp}] {str(event)}"
+            message = f"[{timestamp}] {event}"
+            color = None
+
+        self._add_event_item(message, color)
+        self._log_realtime_event(message)
 
-        if message:
-            self._add_event_item(message, color)
-            self._log_realtime_event(message)
+    def _seen_recent_event(self, key: tuple) -> bool:
+        """key 是否為近期重複事件；不是的話順便記下來。"""
+        if key in self._recent_event_set:
+            return True
+        recent = self.recent_events
+        if len(recent) == recent.maxlen:
+            self._recent_event_set.discard(recent[0])
+        recent.append(key)
+        self._recent_event_set.add(key)
+        return False
+
+    def _on_tiktok_dict_event(self, event: dict, log_sink: Optional[List[str]] = None):
+        # 冷路徑：LOG 等仍以 dict 傳遞的事件；給了 log_sink 時 LOG 只收集不立即寫入
+        event_type = event.get("type")
+
+        user = event.get('user', '匿名')
+        message_content = event.get('message', '') or event.get('gift_name', '') or str(event.get('count', ''))
+        event_key = (event_type, user, message_content)
+
+        if self._seen_recent_event(event_key):
+            return
+
+        if event_type == "LOG":
+            line = f"[TikTok] [{event.get('tag', 'INFO')}] {event.get('message', '')}"
+            if log_sink is not None:
+                log_sink.append(line)
+            else:
+                self._log(line)
+            return
+
+        message = f"[{time.strftime('%H:%M:%S')}] {str(event)}"
+        self._add_event_item(message, None)
+        self._log_realtime_event(message)
 
 
     def _translate_comment_async(self, user: str, original: str, also_tts: bool):
@@ -3178,7 +4247,7 @@ class MainWindow(QMainWindow):
                         trans_line = f"[{ts}] 💬 {user}: {translated_text}"
 
                         # --- 關鍵修改：呼叫新的輔助函式來顯示 ---
-                        self._add_event_item(trans_line, QColor("orange"))
+                        self._add_event_item(trans_line, _EVENT_BRUSHES["orange"])
 
                         self._log_realtime_event(f"↳ 翻譯 ({user}): {translated_text}")
 
@@ -3298,7 +4367,7 @@ class MainWindow(QMainWindow):
         triggered = False
 
         path = trigger.get("path")
-        if path and os.path.exists(path):
+        if path and _path_exists_cached(path):
             self._log(f"關鍵字觸發: '{trigger.get('keyword')}' -> 播放 {os.path.basename(path)}")
             self.tiktok_listener.on_video_triggered.emit(path, False, 1)
             triggered = True
@@ -3314,6 +4383,10 @@ class MainWindow(QMainWindow):
         if not comment:
             return
 
+        # 比對器重建時已收齊所有關鍵字；沒有任何關鍵字就不必掃描
+        if not self._trigger_by_keyword:
+            return
+
         text = comment.lower()
 
         # 1) Aho-Corasick（最佳效能）
@@ -3325,13 +4398,12 @@ class MainWindow(QMainWindow):
             return
 
         # 2) 回退：單一正則（效能佳於逐一 substring）
+        #    與 Aho-Corasick 相同：依序嘗試每個命中的關鍵字，觸發成功即停止
         if self._trigger_regex is not None:
-            m = self._trigger_regex.search(text)
-            if m:
-                kw = m.group(0).lower()
-                trig = self._trigger_by_keyword.get(kw)
-                if trig:
-                    self._perform_trigger(trig)
+            for m in self._trigger_regex.finditer(text):
+                trig = self._trigger_by_keyword.get(m.group(0))
+                if trig and self._perform_trigger(trig):
+                    break
             return
 
         # 3) 最終回退：逐一 substring（避免完全失效）
@@ -3341,36 +4413,39 @@ class MainWindow(QMainWindow):
                 if self._perform_trigger(trig):
                     break
 
+    def _sync_comment_options(self, *_):
+        tab = getattr(self, "tab_gifts", None)
+        if tab is None:
+            return
+        self._read_comment_enabled = tab.read_comment_checkbox.isChecked()
+        self._show_original_comment = tab.show_original_comment_checkbox.isChecked()
+        self._tts_truncate_enabled = tab.tts_truncate_checkbox.isChecked()
+        if tab.tts_filter_checkbox.isChecked():
+            self._tts_filter_keywords = tuple(
+                kw.strip() for kw in tab.tts_filter_edit.text().split(',') if kw.strip())
+        else:
+            self._tts_filter_keywords = ()
+
     def _process_and_say_comment(self, user: str, comment_text: str):
         """
         一個集中的函式，在朗讀留言前進行過濾和截斷。
         (新版：截斷功能改為作用於使用者暱稱)
         """
         # 檢查朗讀功能是否開啟
-        read_enabled = getattr(self.tab_gifts, "read_comment_checkbox",
-                               None) and self.tab_gifts.read_comment_checkbox.isChecked()
-        if not read_enabled:
-            return
-
-        # 1. 執行暱稱過濾 (這部分邏輯不變)
-        filter_enabled = getattr(self.tab_gifts, "tts_filter_checkbox",
-                                 None) and self.tab_gifts.tts_filter_checkbox.isChecked()
-        if filter_enabled:
-            keywords_text = getattr(self.tab_gifts, "tts_filter_edit",
-                                    None) and self.tab_gifts.tts_filter_edit.text().strip()
-            if keywords_text:
-                filter_keywords = [kw.strip() for kw in keywords_text.split(',') if kw.strip()]
-                for keyword in filter_keywords:
-                    if keyword in user:
-                        self._log(f"🚫 朗讀過濾：因暱稱 '{user}' 包含關鍵字 '{keyword}'，已略過留言。")
-                        return  # 找到符合的關鍵字，直接返回，不朗讀
+        if not self._read_comment_enabled:
+            return
+
+        # 1. 執行暱稱過濾（關鍵字已在設定變動時切割好）
+        for keyword in self._tts_filter_keywords:
+            if keyword in user:
+                self._log(f"🚫 朗讀過濾：因暱稱 '{user}' 包含關鍵字 '{keyword}'，已略過留言。")
+                return  # 找到符合的關鍵字，直接返回，不朗讀
 
         # --- 關鍵修改：將截斷邏輯從留言改為暱稱 ---
 
         # 2. 準備最終要朗讀的暱稱和留言
         final_user = user
-        truncate_enabled = getattr(self.tab_gifts, "tts_truncate_checkbox",
-                                   None) and self.tab_gifts.tts_truncate_checkbox.isChecked()
+        truncate_enabled = self._tts_truncate_enabled
 
         # 如果啟用截斷，且暱稱長度超過 6，則只取前 6 個字
         if truncate_enabled and len(user) > 6:
@@ -3384,78 +4459,127 @@ class MainWindow(QMainWindow):
 
     def _log_realtime_event(self, message: str):
         timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-        self.event_log_buffer.append(f"[{timestamp}] {message}\n")
-        if len(self.event_log_buffer) >= 100:
+        line = f"[{timestamp}] {message}\n"
+        self.event_log_buffer.append(line)
+        self._event_log_buffer_chars += len(line)
+        if (len(self.event_log_buffer) >= self._EVENT_LOG_FLUSH_LINES
+                or self._event_log_buffer_chars >= self._EVENT_LOG_FLUSH_CHARS):
+            # 爆量時不等計時器，直接寫出
             self._flush_log_buffer_to_file()
+        elif not self.log_write_timer.isActive():
+            self.log_write_timer.start(1000)
 
     def _flush_log_buffer_to_file(self):
         if not self.event_log_buffer:
             return
-        try:
-            with open(self.EVENTS_LOG_FILE, "a", encoding="utf-8") as f:
-                f.writelines(self.event_log_buffer)
-            self.event_log_buffer.clear()
-        except IOError as e:
-            print(f"錯誤: 無法寫入即時動態日誌: {e}")
+        # 合併成單一字串交給背景寫檔執行緒（編碼、寫入、失敗重試都在那邊），UI 執行緒不碰磁碟
+        self._event_log_writer.write("".join(self.event_log_buffer))
+        self.event_log_buffer.clear()
+        self._event_log_buffer_chars = 0
+        self.log_write_timer.stop()
 
     def _on_tiktok_status(self, status: str):
         # 更新 GiftsTab 的狀態顯示與按鈕
-        if hasattr(self, "tab_gifts"):
-            self.tab_gifts.tiktok_status_label.setText(f"状态: {status}")
-            if "已連線" in status or "已连线" in status:
-                self.tab_gifts.tiktok_status_label.setStyleSheet("color: green; font-weight: bold;")
-                self.tab_gifts.tiktok_start_btn.setEnabled(False)
-                self.tab_gifts.tiktok_stop_btn.setEnabled(True)
-            elif "錯誤" in status or "错误" in status or "已斷線" in status or "已断线" in status:
-                self.tab_gifts.tiktok_status_label.setStyleSheet("color: red;")
-                self.tab_gifts.tiktok_start_btn.setEnabled(True)
-                self.tab_gifts.tiktok_stop_btn.setEnabled(False)
-            elif "正在連線" in status or "正在连线" in status:
-                self.tab_gifts.tiktok_status_label.setStyleSheet("color: orange;")
-            else:
-                self.tab_gifts.tiktok_status_label.setStyleSheet("")
-                self.tab_gifts.tiktok_start_btn.setEnabled(True)
-                self.tab_gifts.tiktok_stop_btn.setEnabled(False)
+        if not hasattr(self, "tab_gifts"):
+            return
+        label = self.tab_gifts.tiktok_status_label
+        text = f"状态: {status}"
+        if label.text() != text:
+            label.setText(text)
+
+        if "已連線" in status or "已连线" in status:
+            key, running = "connected", True
+        elif "錯誤" in status or "错误" in status or "已斷線" in status or "已断线" in status:
+            key, running = "error", False
+        elif "正在連線" in status or "正在连线" in status:
+            key, running = "connecting", None  # 連線中不改按鈕狀態
+        else:
+            key, running = "idle", False
+
+        # 只有狀態類別改變時才重設樣式表，避免每則狀態都觸發 Qt 重新解析 QSS；
+        # 上次套用的類別記在 Python 端，比對時不必再向 widget 查詢 property
+        if key != self._status_qss_key:
+            label.setStyleSheet(self._STATUS_QSS[key])
+            self._status_qss_key = key
+        # 按鈕也會被 GiftsTab 的開始/停止直接切換，所以以按鈕實際狀態比對，不另外快取
+        if running is not None and self.tab_gifts.tiktok_stop_btn.isEnabled() != running:
+            self.tab_gifts.tiktok_start_btn.setEnabled(not running)
+            self.tab_gifts.tiktok_stop_btn.setEnabled(running)
 
     # 舊版 gifts-tab 相關儲存/載入 → 改為呼叫 GiftsTab
     def _load_gift_map(self):
         if not os.path.exists(self.GIFT_MAP_FILE):
             return
         try:
-            with open(self.GIFT_MAP_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            with open(self.GIFT_MAP_FILE, "rb") as f:
+                data = _json_loads(f.read())
             self.tab_gifts.load_settings(data)
             self.playback_volume = self.tab_gifts.playback_volume
         except (IOError, json.JSONDecodeError) as e:
             self._log(f"錯誤: 無法載入禮物設定: {e}")
 
     def _save_gift_map(self):
+        self._gift_map_save_timer.start()
+
+    def _do_save_gift_map(self):
+        self._gift_map_save_timer.stop()
         try:
             data = self.tab_gifts.get_settings()
-            with open(self.GIFT_MAP_FILE, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            self._build_path_to_gift_id_map()
-        except IOError as e:
+            self._saver.schedule(self.GIFT_MAP_FILE, _json_dumps(data))
+        except (TypeError, ValueError) as e:
             self._log(f"錯誤: 無法儲存禮物設定: {e}")
 
+    def _set_viewer_count_text(self, text: str):
+        if self.viewer_count_label.text() != text:
+            self.viewer_count_label.setText(text)
+
+    def _apply_viewer_diff(self, new_viewers: set):
+        # viewer_list 依暱稱排序，_viewer_sorted 是它的鏡像，列號可直接用 bisect 求得
+        removed = self._viewer_cache - new_viewers
+        added = new_viewers - self._viewer_cache
+        lst = self.viewer_list
+        lst.setUpdatesEnabled(False)
+        try:
+            if len(removed) + len(added) > len(new_viewers) // 2:
+                # 大半名單都換了：整份重建比逐筆插入/刪除便宜
+                self._viewer_sorted = sorted(new_viewers)
+                lst.clear()
+                lst.addItems(self._viewer_sorted)
+            else:
+                sorted_names = self._viewer_sorted
+                # 由後往前刪，前面的列號才不會跑掉
+                for row in sorted((bisect.bisect_left(sorted_names, n) for n in removed), reverse=True):
+                    del sorted_names[row]
+                    lst.takeItem(row)
+                for name in sorted(added):
+                    row = bisect.bisect_left(sorted_names, name)
+                    sorted_names.insert(row, name)
+                    lst.insertItem(row, name)
+        finally:
+            lst.setUpdatesEnabled(True)
+        self._viewer_cache = new_viewers
+
     def _update_viewer_list(self):
         if not (self.tiktok_listener and self.tiktok_listener.running and self.tiktok_listener.client):
-            self.viewer_count_label.setText("在线人数: N/A")
+            self._set_viewer_count_text("在线人数: N/A")
             return
         try:
             client = self.tiktok_listener.client
-            self.viewer_count_label.setText(f"在线人数: {client.viewer_count}")
-            current_viewers = {self.viewer_list.item(i).text() for i in range(self.viewer_list.count())}
+            self._set_viewer_count_text(f"在线人数: {client.viewer_count}")
+            # 與上次顯示的名單（Python 端快取）比對，不必每次逐列讀回 viewer_list
             new_viewers = {viewer.nickname for viewer in client.viewers}
-            if current_viewers != new_viewers:
-                self.viewer_list.clear()
-                self.viewer_list.addItems(sorted(list(new_viewers)))
+            if new_viewers != self._viewer_cache:
+                self._apply_viewer_diff(new_viewers)
         except Exception:
             pass
 
     def _manage_gift_list(self):
+        version = self.gift_manager.version
         dialog = GiftListDialog(self, gift_manager=self.gift_manager)
         dialog.exec()
+        if self.gift_manager.version != version:
+            self._build_path_to_gift_id_map()  # 禮物英文名/ID 可能已變動
+            self.tab_gifts._refresh_gift_tree()  # 顯示名稱也可能已變動
         self._refresh_menu_content()
 
     # 替換 MainWindow._on_volume_changed
@@ -3470,9 +4594,11 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         self._flush_log_buffer_to_file()
-        self._auto_save_library()
-        self._save_gift_map()
+        self._event_log_writer.close()  # 寫完剩餘的日誌再結束背景執行緒
+        self._do_auto_save_library()
+        self._do_save_gift_map()  # 關閉時不等合併計時器，直接取快照
         self._save_audio_levels()  # 新增：保存個別音量
+        self._saver.flush()  # 把尚在延遲中的禮物設定/清單立即寫出
 
 
         self.tiktok_listener.stop()
@@ -3486,14 +4612,15 @@ class MainWindow(QMainWindow):
         event.accept()
 
     def _prune_invalid_gift_mappings(self):
-        before = len(self.tiktok_listener.gift_map)
-        self.tiktok_listener.gift_map = [
-            m for m in self.tiktok_listener.gift_map
-            if m.get("path") and os.path.exists(m["path"])
-        ]
-        if len(self.tiktok_listener.gift_map) != before:
+        current = self.tiktok_listener.gift_map
+        kept, removed = [], []
+        for m in current:
+            (kept if m.get("path") and os.path.exists(m["path"]) else removed).append(m)
+        if removed:
+            self.tiktok_listener.set_gift_map(kept)
+            for m in removed:
+                self._index_remove(m)
             self._save_gift_map()
-            self._build_path_to_gift_id_map()
             if hasattr(self, "tab_gifts"):
                 self.tab_gifts._refresh_gift_tree()
 
@@ -3510,10 +4637,10 @@ if __name__ == "__main__":
             None, "缺少相依性",
             "錯誤: 'python-mpv' 函式庫未安裝。\n請執行: pip install python-mpv")
         sys.exit(1)
-    if not cv2:
+    if not _can_probe_video_dims():
         QMessageBox.warning(
             None, "缺少相依性",
-            "警告: 'opencv-python' (cv2) 未安裝。\n將無法獲取影片的正確長寬比。")
+            "警告: 'av' (PyAV)、ffprobe 與 'opencv-python' (cv2) 皆不可用。\n將無法獲取影片的正確長寬比。")
     if not _HAS_PILLOW:
         QMessageBox.warning(
             None, "缺少相依性",
@@ -5,12 +5,49 @@ Data managers for Overlay UltraLite
 - SettingsManager: gift_map.json（含 url/api_key/gift_map/fallback/interrupt/volume）
 - LibraryManager: library.json 影片清單的讀寫
 - ThemeManager: theme.json 主題設定的讀寫
+- DebouncedSaver: 背景延遲合併寫檔（短時間內多次儲存只寫最後一次）
+- atomic_write_json: 暫存檔 + fsync + os.replace 的原子寫檔
+- AppendLogWriter: 背景執行緒合併追加寫檔（即時動態日誌）
 """
 
 from __future__ import annotations
 import json
 import os
-from typing import Any, Dict, List, Optional
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Union
+
+try:
+    import orjson  # 可缺省：較快的 JSON 編解碼
+    _HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    _HAS_ORJSON = False
+
+
+def _atomic_write_text(path: str, text: Union[str, bytes]):
+    """先寫入同目錄暫存檔、fsync 後再 os.replace，避免寫到一半（或斷電）的檔案被讀到。
+
+    str 會先整份編成 UTF-8；一律以二進位模式單次 write，不經文字層的分段編碼。
+    """
+    data = text.encode("utf-8") if isinstance(text, str) else text
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def atomic_write_json(path: str, obj: Any):
+    """同步版的原子 JSON 寫檔（縮排 2、保留中文）。"""
+    if _HAS_ORJSON:
+        # orjson 直接產生 UTF-8 bytes，不必解碼再編碼
+        text = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        text = json.dumps(obj, indent=2, ensure_ascii=False)
+    _atomic_write_text(path, text)
 
 
 class _JsonFile:
@@ -21,15 +58,16 @@ class _JsonFile:
         if not os.path.exists(self.path):
             return default
         try:
+            if _HAS_ORJSON:
+                with open(self.path, "rb") as f:
+                    return orjson.loads(f.read())
             with open(self.path, "r", encoding="utf-8") as f:
                 return json.load(f)
-        except (IOError, json.JSONDecodeError):
+        except (IOError, ValueError):  # orjson.JSONDecodeError 與 json.JSONDecodeError 皆為 ValueError
             return default
 
     def _save(self, data: Any):
-        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
-        with open(self.path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        atomic_write_json(self.path, data)
 
 
 class LayoutsManager(_JsonFile):
@@ -169,3 +207,136 @@ class ThemeManager(_JsonFile):
         if isinstance(theme, dict):
             out.update(theme)
         self._save(out)
+
+
+class DebouncedSaver:
+    """
+    延遲合併寫檔：同一路徑在 delay 秒內多次 schedule，只在背景寫出最後一份內容。
+    呼叫端負責先序列化（快照，str 或 UTF-8 bytes），這裡只做 I/O。關閉程式前請呼叫 flush()。
+    """
+    def __init__(self, delay: float = 0.5, on_error: Optional[Callable[[str, Exception], None]] = None):
+        self.delay = delay
+        self._on_error = on_error
+        self._lock = threading.Lock()      # 保護 _pending/_timers
+        self._io_lock = threading.Lock()   # 序列化實際寫檔，確保寫入順序
+        self._pending: Dict[str, Union[str, bytes]] = {}
+        self._timers: Dict[str, threading.Timer] = {}
+
+    def schedule(self, path: str, text: Union[str, bytes]):
+        with self._lock:
+            self._pending[path] = text
+            old = self._timers.pop(path, None)
+            if old:
+                old.cancel()
+            timer = threading.Timer(self.delay, self._write, args=(path,))
+            timer.daemon = True
+            self._timers[path] = timer
+            timer.start()
+
+    def _write(self, path: str):
+        with self._io_lock:
+            with self._lock:
+                text = self._pending.pop(path, None)
+                self._timers.pop(path, None)
+            if text is not None:
+                self._write_now(path, text)
+
+    def _write_now(self, path: str, text: Union[str, bytes]):
+        try:
+            _atomic_write_text(path, text)
+        except OSError as e:
+            if self._on_error:
+                self._on_error(path, e)
+            else:
+                print(f"錯誤: 無法寫入 {path}: {e}")
+
+    def flush(self):
+        """立即寫出所有尚未寫入的內容（同步）。"""
+        with self._io_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                for timer in self._timers.values():
+                    timer.cancel()
+                self._timers.clear()
+            for path, text in pending.items():
+                self._write_now(path, text)
+
+
+class AppendLogWriter:
+    """
+    背景追加寫檔：呼叫端只把文字交給 write()，由專用執行緒把期間累積的內容
+    合併、一次編成 UTF-8 後單次寫出。檔案在第一次寫出時開啟並保留；
+    寫入失敗時內容留在佇列，稍後重試。close() 會先寫完剩餘內容再關檔。
+    """
+    RETRY_DELAY = 5.0
+
+    def __init__(self, path: str, max_pending: int = 1000,
+                 on_error: Optional[Callable[[str, Exception], None]] = None):
+        self.path = path
+        self._on_error = on_error
+        self._cond = threading.Condition()
+        # 上限保護（以 write() 次數計）：寫檔持續失敗時只保留最新的幾批，不會無限成長
+        self._pending: deque[str] = deque(maxlen=max_pending)
+        self._closed = False
+        self._fh = None
+        self._thread = threading.Thread(target=self._run, name="AppendLogWriter", daemon=True)
+        self._thread.start()
+
+    def write(self, text: str):
+        if not text:
+            return
+        with self._cond:
+            if self._closed:
+                return
+            self._pending.append(text)
+            self._cond.notify()
+
+    def close(self, timeout: float = 2.0):
+        """停止背景執行緒；剩餘內容會先嘗試寫出一次。"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout=timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                batch = list(self._pending)
+                self._pending.clear()
+                closing = self._closed
+            if batch and not self._write_batch(batch) and not closing:
+                with self._cond:
+                    # 失敗的內容放回最前面，維持先後次序；等一陣子（或關閉）再重試
+                    self._pending.extendleft(reversed(batch))
+                    self._cond.wait(timeout=self.RETRY_DELAY)
+                continue
+            if closing:
+                break
+        self._close_file()
+
+    def _write_batch(self, batch: List[str]) -> bool:
+        blob = "".join(batch).encode("utf-8")
+        try:
+            if self._fh is None:
+                self._fh = open(self.path, "ab")
+            self._fh.write(blob)
+            self._fh.flush()
+            return True
+        except OSError as e:
+            # 丟掉可能已損壞的檔案代號，重試時重新開啟
+            self._close_file()
+            if self._on_error:
+                self._on_error(self.path, e)
+            else:
+                print(f"錯誤: 無法寫入 {self.path}: {e}")
+            return False
+
+    def _close_file(self):
+        fh, self._fh = self._fh, None
+        if fh is not None:
+            try:
+                fh.close()
+            except OSError:
+                pass
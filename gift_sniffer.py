@@ -25,6 +25,8 @@ from concurrent.futures import TimeoutError
 from dataclasses import dataclass
 from typing import Dict, Any, Optional, List, Tuple
 
+from data_managers import atomic_write_json
+
 # PySide6
 from PySide6.QtCore import Qt, QThread, Signal, Slot, QByteArray
 from PySide6.QtWidgets import (
@@ -96,8 +98,7 @@ def load_config() -> Dict[str, Any]:
 
 def save_config(cfg: Dict[str, Any]) -> None:
     try:
-        with open(CFG_FILE, "w", encoding="utf-8") as f:
-            json.dump(cfg, f, ensure_ascii=False, indent=2)
+        atomic_write_json(CFG_FILE, cfg)
     except Exception:
         pass
 
@@ -160,9 +161,8 @@ class GiftSnifferWorker(QThread):
 
     def _save_seen(self):
         try:
-            os.makedirs(os.path.dirname(self.out_path) or ".", exist_ok=True)
-            with open(self.out_path, "w", encoding="utf-8") as f:
-                json.dump(self._seen, f, ensure_ascii=False, indent=2)
+            # 每收到一個禮物就會重寫；原子寫入避免中途中斷留下半個檔案
+            atomic_write_json(self.out_path, self._seen)
         except Exception as e:
             self.error.emit(self.username, f"無法寫入 {self.out_path}: {e}")
 
@@ -557,8 +557,7 @@ class MainWindow(QMainWindow):
         if not out:
             return
         try:
-            with open(out, "w", encoding="utf-8") as f:
-                json.dump(rows, f, ensure_ascii=False, indent=2)
+            atomic_write_json(out, rows)
             QMessageBox.information(self, "完成", f"已匯出 {len(rows)} 筆到：\n{out}")
         except Exception as e:
             QMessageBox.warning(self, "錯誤", f"寫入失敗：{e}")
@@ -1,15 +1,14 @@
 # Project: UniTTS-OneVoice-Tunable
 import threading, time
 from collections import deque
+from importlib.util import find_spec
 from typing import List, Optional
-from PySide6.QtCore import QObject
+from PySide6.QtCore import QObject, Signal
 
-try:
-    import pyttsx3
-    _HAS_TTS = True
-except ImportError:
-    pyttsx3 = None  # type: ignore
-    _HAS_TTS = False
+# pyttsx3 只先偵測是否安裝，實際 import 延到朗讀執行緒啟動時（見 _run）
+pyttsx3 = None  # type: ignore
+_HAS_TTS = find_spec("pyttsx3") is not None
+if not _HAS_TTS:
     print("[WARN] pip install pyttsx3")
 
 try:
@@ -41,6 +40,9 @@ def _pick_universal_voice(engine: "pyttsx3.Engine") -> Optional[str]:
 
 
 class SpeechEngine(QObject):
+    # 待朗讀佇列內容變動（可能由朗讀執行緒發出；一律在釋放鎖之後 emit）
+    queue_changed = Signal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.engine: Optional["pyttsx3.Engine"] = None  # type: ignore
@@ -92,6 +94,7 @@ class SpeechEngine(QObject):
         with self._cond:
             self.queue.append(text.strip())
             self._cond.notify()
+        self.queue_changed.emit()
 
     def snapshot(self) -> List[str]:
         with self._lock:
@@ -100,9 +103,12 @@ class SpeechEngine(QObject):
     def stop(self, graceful: bool = True):
         with self._cond:
             self.running = False
+            dropped = not graceful and bool(self.queue)
             if not graceful:
                 self.queue.clear()
             self._cond.notify_all()
+        if dropped:
+            self.queue_changed.emit()
         th = self.thread
         if th and th.is_alive():
             th.join(timeout=5.0)
@@ -127,6 +133,19 @@ class SpeechEngine(QObject):
             time.sleep(0.01)
 
     def _run(self):
+        global pyttsx3
+        if pyttsx3 is None:
+            try:
+                import pyttsx3 as _pyttsx3
+            except ImportError as e:
+                print(f"[WARN] pyttsx3 載入失敗: {e}")
+                with self._cond:
+                    self.running = False
+                    self.queue.clear()
+                self.queue_changed.emit()
+                return
+            pyttsx3 = _pyttsx3
+
         if _HAS_PYCOM:
             try:
                 pythoncom.CoInitialize()
@@ -161,6 +180,7 @@ class SpeechEngine(QObject):
                     if not self.running and not self.queue:
                         break
                     text = self.queue.popleft()
+                self.queue_changed.emit()
 
                 # 套用目前速率與音量
                 try:
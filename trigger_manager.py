@@ -2,6 +2,8 @@ import json
 import os
 from typing import List, Dict, Any
 
+from data_managers import atomic_write_json
+
 TriggerItem = Dict[str, Any]
 
 class TriggerManager:
@@ -27,9 +29,8 @@ class TriggerManager:
 
     def save(self):
         try:
-            with open(self.filename, "w", encoding="utf-8") as f:
-                json.dump(self.triggers, f, indent=2, ensure_ascii=False)
-        except IOError:
+            atomic_write_json(self.filename, self.triggers)
+        except (IOError, TypeError, ValueError):
             print(f"錯誤: 無法儲存觸發器清單到 {self.filename}")
 
     def get_all_triggers(self) -> List[TriggerItem]:
@@ -1,5 +1,6 @@
 import os
 import json
+from importlib.util import find_spec
 from typing import Dict, List, Optional
 
 from PySide6.QtCore import Qt, QTimer, QPoint, QRect, QSize, Property, QPropertyAnimation, QEasingCurve
@@ -11,14 +12,21 @@ from PySide6.QtWidgets import (
     QListWidgetItem, QWidget, QGridLayout, QGroupBox
 )
 
-# 依賴 Pillow
-try:
-    from PIL import Image
+# 依賴 Pillow：啟動時只偵測是否安裝，第一次讀圖時才 import（見 _get_pil_image）
+_HAS_PILLOW = find_spec("PIL") is not None
+Image = None
 
-    _HAS_PILLOW = True
-except ImportError:
-    Image = None
-    _HAS_PILLOW = False
+
+def _get_pil_image():
+    """回傳 PIL.Image 模組；未安裝或載入失敗時回傳 None。"""
+    global Image, _HAS_PILLOW
+    if Image is None and _HAS_PILLOW:
+        try:
+            from PIL import Image as _image
+            Image = _image
+        except ImportError:
+            _HAS_PILLOW = False
+    return Image
 
 
 # 為了避免循環導入，我們使用字串形式的類型提示
@@ -493,10 +501,11 @@ class MenuItemWidget(QWidget):
         self.counter_label.setVisible(show)
 
     def _load_pixmap(self, path: str) -> Optional[QPixmap]:
-        if not _HAS_PILLOW:
+        pil_image = _get_pil_image()
+        if pil_image is None:
             return QPixmap(path)
         try:
-            with Image.open(path) as img:
+            with pil_image.open(path) as img:
                 if img.mode != "RGBA":
                     img = img.convert("RGBA")
                 qimage = QImage(img.tobytes(), img.width, img.height,
@@ -535,6 +544,12 @@ class GameMenuContainer(QFrame):
         self.apply_theme()
 
         self.list_widget = QListWidget(self)
+        # 由 update_menu_data 建立：依序的項目元件，以及 gift id / name_en -> 元件，
+        # 更新計數或高亮時直接查表，不必逐列 itemWidget()
+        self._widgets: List[MenuItemWidget] = []
+        self._widgets_by_id: Dict[str, MenuItemWidget] = {}
+        self._widgets_by_key: Dict[str, MenuItemWidget] = {}
+        self._show_counter = True  # 目前各項目觸發計數的顯示狀態
         self.list_widget.setStyleSheet("background-color: transparent; border: none;")
         self.list_widget.setFocusPolicy(Qt.FocusPolicy.NoFocus)
         self.list_widget.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
@@ -546,6 +561,10 @@ class GameMenuContainer(QFrame):
     def update_menu_data(self, gifts: List[dict], counts: Dict[str, int], show_counter: bool):
         """填充 QListWidget，並設置計數器"""
         self.list_widget.clear()
+        self._widgets = []
+        self._widgets_by_id = {}
+        self._widgets_by_key = {}
+        self._show_counter = show_counter
         for gift in gifts:
             item_widget = MenuItemWidget(gift, self.theme_settings)
 
@@ -559,15 +578,36 @@ class GameMenuContainer(QFrame):
             list_item.setData(Qt.ItemDataRole.UserRole, gift.get("name_en"))
             self.list_widget.addItem(list_item)
             self.list_widget.setItemWidget(list_item, item_widget)
+            self._widgets.append(item_widget)
+            # 同鍵以第一筆為準，與原本逐列尋找的結果一致
+            self._widgets_by_id.setdefault(gift_id, item_widget)
+            self._widgets_by_key.setdefault(gift.get("name_en"), item_widget)
+
+    def menu_widgets(self) -> List[MenuItemWidget]:
+        """目前菜單上的所有項目元件（依顯示順序）。"""
+        return self._widgets
+
+    def set_show_counter(self, show: bool):
+        """切換所有項目的觸發計數顯示；狀態沒變或菜單是空的就什麼都不做。"""
+        if show == self._show_counter:
+            return
+        self._show_counter = show
+        if not self._widgets:
+            return
+        self.list_widget.setUpdatesEnabled(False)
+        try:
+            for widget in self._widgets:
+                widget.show_counter(show)
+        finally:
+            self.list_widget.setUpdatesEnabled(True)
+
+    def widget_for_gift_id(self, gift_id: str) -> Optional[MenuItemWidget]:
+        return self._widgets_by_id.get(gift_id)
 
     def highlight_item_by_key(self, key: str):
-        for i in range(self.list_widget.count()):
-            list_item = self.list_widget.item(i)
-            if list_item.data(Qt.ItemDataRole.UserRole) == key:
-                widget = self.list_widget.itemWidget(list_item)
-                if isinstance(widget, MenuItemWidget):
-                    widget.trigger_highlight()
-                break
+        widget = self._widgets_by_key.get(key)
+        if widget is not None:
+            widget.trigger_highlight()
 
     def setEditing(self, is_editing: bool):
         self._is_editing = is_editing
@@ -646,47 +686,37 @@ class GameMenuContainer(QFrame):
 
 
 class TriggerEditDialog(QDialog):
-    def __init__(self, parent=None, item: Optional[dict] = None, library_paths: List[str] = []):
+    def __init__(self, parent=None, item: Optional[dict] = None, library_paths: Optional[List[str]] = None):
         super().__init__(parent)
         self.setWindowTitle("編輯關鍵字觸發")
         self.item = item or {}
+        self._filled_paths: Optional[List[str]] = None
         layout = QVBoxLayout(self)
 
         # 關鍵字輸入
         kw_layout = QHBoxLayout()
         kw_layout.addWidget(QLabel("觀眾留言關鍵字:"))
-        self.keyword_edit = QLineEdit(self.item.get("keyword", ""))
+        self.keyword_edit = QLineEdit()
         kw_layout.addWidget(self.keyword_edit)
         layout.addLayout(kw_layout)
 
         # 觸發影片 (可選)
         self.video_group = QGroupBox("觸發影片 (可選)")
         self.video_group.setCheckable(True)
-        self.video_group.setChecked(bool(self.item.get("path")))
         video_layout = QHBoxLayout(self.video_group)
 
         video_layout.addWidget(QLabel("影片路徑:"))
         self.path_combo = QComboBox()
-        self.path_combo.addItem("--- 不選擇影片 ---", userData="")
-        for path in library_paths:
-            self.path_combo.addItem(os.path.basename(path), userData=path)
-
-        current_path = self.item.get("path", "")
-        if current_path:
-            index = self.path_combo.findData(current_path)
-            if index >= 0:
-                self.path_combo.setCurrentIndex(index)
         video_layout.addWidget(self.path_combo)
         layout.addWidget(self.video_group)
 
         # 朗讀指定回覆 (可選)
         self.tts_group = QGroupBox("朗讀指定回覆 (可選)")
         self.tts_group.setCheckable(True)
-        self.tts_group.setChecked(bool(self.item.get("tts_response")))
         tts_layout = QHBoxLayout(self.tts_group)
 
         tts_layout.addWidget(QLabel("朗讀內容:"))
-        self.tts_response_edit = QLineEdit(self.item.get("tts_response", ""))
+        self.tts_response_edit = QLineEdit()
         tts_layout.addWidget(self.tts_response_edit)
         layout.addWidget(self.tts_group)
 
@@ -698,6 +728,30 @@ class TriggerEditDialog(QDialog):
         # 將 groupbox 的勾選狀態與內部元件的啟用狀態連動
         self.video_group.toggled.connect(self.path_combo.setEnabled)
         self.tts_group.toggled.connect(self.tts_response_edit.setEnabled)
+
+        self.populate(item, library_paths)
+
+    def populate(self, item: Optional[dict] = None, library_paths: Optional[List[str]] = None):
+        """填入（或換上）要編輯的項目；可重複使用同一個對話框，影片清單沒變就不重填。"""
+        self.item = item or {}
+        library_paths = library_paths or []
+        self.keyword_edit.setText(self.item.get("keyword", ""))
+
+        if self._filled_paths != library_paths:
+            self.path_combo.clear()
+            self.path_combo.addItem("--- 不選擇影片 ---", userData="")
+            for path in library_paths:
+                self.path_combo.addItem(os.path.basename(path), userData=path)
+            self._filled_paths = list(library_paths)
+
+        current_path = self.item.get("path", "")
+        index = self.path_combo.findData(current_path) if current_path else -1
+        self.path_combo.setCurrentIndex(max(index, 0))
+        self.video_group.setChecked(bool(current_path))
+
+        self.tts_response_edit.setText(self.item.get("tts_response", ""))
+        self.tts_group.setChecked(bool(self.item.get("tts_response")))
+
         self.path_combo.setEnabled(self.video_group.isChecked())
         self.tts_response_edit.setEnabled(self.tts_group.isChecked())
 
@@ -480,7 +480,7 @@ class MainWindow(QMainWindow):
             # 從 GiftsTab 獲取需要儲存的資料
             data = self.tab_gifts.get_settings()
             with open(self.GIFT_MAP_FILE, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+                f.write(json.dumps(data, indent=2, ensure_ascii=False))
             self._build_path_to_gift_id_map()
         except IOError as e:
             self._log(f"錯誤: 無法儲存禮物設定: {e}")